@@ -1,16 +1,52 @@
+import asyncio
+import time
 from motor.motor_asyncio import AsyncIOMotorClient
 from .settings import settings
 
+
+class DatabaseUnavailable(RuntimeError):
+    """Raised when the database is used while no client is connected (read-only snapshot mode)."""
+
+
 class MongoDB:
     """MongoDB connection manager."""
     
     client: AsyncIOMotorClient = None
+    # Pool and command listeners attached to every client this class creates
+    event_listeners: list = []
     
     @classmethod
     async def connect_db(cls):
-        """Connect to MongoDB."""
-        cls.client = AsyncIOMotorClient(settings.mongodb_uri)
+        """Connect to MongoDB and pre-open the minimum number of pooled connections."""
+        options = {
+            "maxPoolSize": settings.mongo_max_pool_size,
+            "minPoolSize": settings.mongo_min_pool_size,
+            "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+            "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+            "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+            "socketTimeoutMS": settings.mongo_socket_timeout_ms,
+            "event_listeners": list(cls.event_listeners),
+        }
+        if settings.mongo_compressors:
+            options["compressors"] = settings.mongo_compressors
+        cls.client = AsyncIOMotorClient(settings.mongodb_uri, **options)
         print(f"Connected to MongoDB at {settings.mongodb_uri}")
+        await cls.warm_up()
+    
+    @classmethod
+    async def warm_up(cls):
+        """Resolve, authenticate and open `mongo_min_pool_size` connections before serving traffic."""
+        latency = await cls.ping()
+        # Concurrent pings force the pool to open one connection each
+        await asyncio.gather(*(cls.ping() for _ in range(settings.mongo_min_pool_size)))
+        print(f"Warmed up MongoDB pool (ping {latency:.1f} ms, {settings.mongo_min_pool_size} connections)")
+    
+    @classmethod
+    async def ping(cls) -> float:
+        """Ping the server and return the round-trip latency in milliseconds."""
+        started = time.perf_counter()
+        await cls.client.admin.command("ping")
+        return (time.perf_counter() - started) * 1000
     
     @classmethod
     async def close_db(cls):
@@ -26,5 +62,7 @@ class MongoDB:
 
 
 def get_db():
-    """Dependency to get database instance."""
+    """Get the database instance."""
+    if MongoDB.client is None:
+        raise DatabaseUnavailable("No MongoDB client is connected")
     return MongoDB.get_database()
@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+
+REQUIRED_INDEXES: Dict[str, List[IndexModel]] = {
+    "roots": [
+        IndexModel([("root", ASCENDING)], name="root_unique", unique=True),
+        IndexModel([("forms", ASCENDING)], name="forms"),
+    ],
+    "translations": [
+        IndexModel([("root", ASCENDING)], name="root"),
+        IndexModel([("kelma", ASCENDING), ("_id", ASCENDING)], name="kelma"),
+        IndexModel([("cat", ASCENDING), ("swadesh", ASCENDING)], name="cat_swadesh"),
+        IndexModel([("cat", ASCENDING), ("noun_type", ASCENDING)], name="cat_noun_type"),
+        IndexModel([("swadesh", ASCENDING)], name="swadesh"),
+        IndexModel([("noun_type", ASCENDING), ("_id", ASCENDING)], name="noun_type"),
+        IndexModel([("english", ASCENDING), ("_id", ASCENDING)], name="english"),
+        IndexModel([("forms", ASCENDING)], name="forms"),
+    ],
+}
+
+_REGEX = {"$regex": "", "$options": "i"}
+
+# Query shapes issued by the services, and whether they read the whole collection by design
+# (full listings and dumps, and the regex search used until the in-process index is loaded)
+SERVICE_QUERIES: List[Tuple[str, Dict[str, Any], Optional[List[Tuple[str, int]]], bool]] = [
+    ("roots", {"_id": ObjectId()}, None, False),
+    ("roots", {"root": ""}, None, False),
+    ("roots", {"root": {"$in": [""]}}, None, False),
+    ("roots", {"_id": {"$gt": ObjectId()}}, [("_id", ASCENDING)], False),
+    ("roots", {"forms": ""}, None, False),
+    ("roots", {}, None, True),
+    ("roots", {}, [("root", ASCENDING)], False),
+    ("roots", {"$or": [{"root": _REGEX}, {"prim": _REGEX}]}, None, True),
+    ("translations", {"_id": ObjectId()}, None, False),
+    ("translations", {"root": ""}, None, False),
+    ("translations", {"root": {"$in": [""]}}, None, False),
+    ("translations", {"_id": {"$gt": ObjectId()}}, [("_id", ASCENDING)], False),
+    ("translations", {"forms": ""}, None, False),
+    ("translations", {"cat": ""}, [("_id", ASCENDING)], False),
+    ("translations", {"cat": "", "noun_type": ""}, [("_id", ASCENDING)], False),
+    ("translations", {"swadesh": True}, [("_id", ASCENDING)], False),
+    ("translations", {"noun_type": ""}, [("_id", ASCENDING)], False),
+    ("translations", {}, [("kelma", ASCENDING), ("_id", ASCENDING)], False),
+    ("translations", {}, [("english", ASCENDING), ("_id", ASCENDING)], False),
+    ("translations", {"$or": [{"kelma": {"$gt": ""}}, {"kelma": "", "_id": {"$gt": ObjectId()}}]},
+     [("kelma", ASCENDING), ("_id", ASCENDING)], False),
+    ("translations", {"$or": [{"english": {"$gt": ""}}, {"english": "", "_id": {"$gt": ObjectId()}}]},
+     [("english", ASCENDING), ("_id", ASCENDING)], False),
+    ("translations", {}, None, True),
+    ("translations", {"root": {"$ne": None}}, None, False),
+    ("translations", {"root": {"$ne": None}}, [("root", ASCENDING)], False),
+    ("translations", {"root": None}, [("kelma", ASCENDING)], False),
+    ("translations", {"cat": ""}, [("kelma", ASCENDING)], False),
+    ("translations", {"$or": [{"kelma": _REGEX}, {"english": _REGEX}, {"root": _REGEX}]}, None, True),
+]
+
+
+def _signature(spec: Dict[str, Any]) -> Tuple:
+    """Comparable description of an index, from a declaration or from index_information()."""
+    key = list(spec["key"].items()) if hasattr(spec["key"], "items") else list(spec["key"])
+    return (tuple(key), bool(spec.get("unique", False)))
+
+
+async def _duplicates(collection, fields: List[str], sample: int = 5) -> List[dict]:
+    """A few key values held by more than one document, with their counts."""
+    cursor = collection.aggregate([
+        {"$group": {"_id": {field: f"${field}" for field in fields}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": sample},
+    ])
+    return await cursor.to_list(length=sample)
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create missing indexes and rebuild those whose definition changed.
+
+    A unique index is skipped, with the offending values reported, while duplicates
+    exist, so that existing data never prevents startup.
+    """
+    for collection_name, models in REQUIRED_INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        missing = []
+        for model in models:
+            spec = model.document
+            current = existing.get(spec["name"])
+            if current is not None and _signature(current) == _signature(spec):
+                continue
+            if spec.get("unique"):
+                duplicates = await _duplicates(collection, list(spec["key"]))
+                if duplicates:
+                    values = ", ".join(f"{d['_id']} x{d['count']}" for d in duplicates)
+                    print(f"Not creating unique index {collection_name}.{spec['name']}; duplicates: {values}")
+                    continue
+            if current is not None:
+                print(f"Rebuilding index {collection_name}.{spec['name']}")
+                await collection.drop_index(spec["name"])
+            missing.append(model)
+        if missing:
+            await collection.create_indexes(missing)
+            print(f"Created indexes on {collection_name}: {', '.join(m.document['name'] for m in missing)}")
+
+
+def _has_collscan(plan: Any) -> bool:
+    """Whether any stage of an explain() plan is a collection scan."""
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(item) for item in plan)
+    return False
+
+
+async def verify_query_plans(db: AsyncIOMotorDatabase) -> None:
+    """Explain every service query and raise if one that should use an index scans a whole collection.
+
+    Queries that read the whole collection by design are explained too, and reported.
+    """
+    offenders, scans = [], []
+    for collection_name, query, sort, full_scan in SERVICE_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        if _has_collscan(explanation["queryPlanner"]["winningPlan"]):
+            (scans if full_scan else offenders).append(f"{collection_name}.find({query})")
+    if offenders:
+        raise RuntimeError(f"Queries without a supporting index: {'; '.join(offenders)}")
+    if scans:
+        print(f"Full collection scans by design: {'; '.join(scans)}")
+    print(f"Verified query plans for {len(SERVICE_QUERIES)} service queries")
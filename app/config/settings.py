@@ -8,6 +8,68 @@ class Settings(BaseSettings):
     mongodb_uri: str
     database_name: str = "kelma"
     allowed_origins: str = "http://localhost:3000"
+
+    # MongoDB connection pool
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 5
+    mongo_max_idle_time_ms: Optional[int] = 300000
+    mongo_server_selection_timeout_ms: int = 5000
+    mongo_connect_timeout_ms: int = 10000
+    mongo_socket_timeout_ms: Optional[int] = None
+    mongo_compressors: str = ""  # e.g. "zstd,snappy,zlib"; zstd/snappy need extra packages
+
+    # Response compression (brotli when installed, otherwise gzip)
+    compression_minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+
+    # Log requests slower than this many milliseconds with a per-phase breakdown (0 disables)
+    slow_request_ms: float = 0
+
+    # Serve roots and translations read-only from a snapshot file instead of MongoDB
+    snapshot_path: Optional[str] = None
+    snapshot_check_seconds: float = 1.0
+
+    # Poll interval for syncing writes from other workers when change streams are unavailable.
+    # An idle poll is one serverStatus command; both collections are re-read after writes
+    sync_poll_seconds: float = 1.0
+
+    # Background exports: directory for result files and job records, shared by the workers
+    # (kelma-exports under the system temporary directory when unset), how many run at once
+    # per worker, and how long finished files are kept
+    export_dir: Optional[str] = None
+    export_max_concurrent: int = 2
+    export_ttl_seconds: float = 3600.0
+
+    # Fuzzy search: largest edit distance indexed, and how many leading characters
+    # of each term get deletion variants (bounds memory per term)
+    fuzzy_max_distance: int = 2
+    fuzzy_prefix_length: int = 7
+
+    # Admission control for expensive reads (listings, searches, facets, entries): requests
+    # beyond the concurrency limit wait in a bounded queue for up to the queue timeout, then
+    # get 503. Per-route overrides as "name=concurrency:queue,...", e.g. "translations.search=4:16".
+    # Every worker applies these limits on its own, so the server admits WORKERS times as many
+    admission_max_concurrent: int = 8
+    admission_queue_size: int = 32
+    admission_queue_timeout_seconds: float = 2.0
+    admission_route_limits: str = ""
+    # Time budget of an expensive read from arrival, passed to MongoDB as maxTimeMS
+    admission_deadline_seconds: float = 10.0
+    # Per-client token bucket over expensive reads: sustained requests per second and burst
+    # (0 disables). Buckets are per worker, so a client may get up to WORKERS times the rate
+    rate_limit_per_second: float = 0.0
+    rate_limit_burst: int = 20
+    # Comma-separated addresses or networks of proxies whose X-Forwarded-For is trusted
+    # to name the client for rate limiting ("*" trusts any peer)
+    forwarded_allow_ips: str = "127.0.0.1"
+
+    # Explain every service query at startup and fail on collection scans
+    index_diagnostics: bool = False
+
+    # Read-through cache
+    cache_max_entries: int = 10000
+    cache_ttl_seconds: float = 300.0
     
     class Config:
         env_file = ".env"
@@ -1,19 +1,65 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from .config.database import MongoDB
+from . import prefork
+from .config.database import MongoDB, get_db
+from .config.indexes import ensure_indexes, verify_query_plans
 from .config.settings import settings
-from .routes import roots, translations
+from .middleware.compression import CompressionMiddleware
+from .middleware.metrics import MetricsMiddleware
+from .routes import autocomplete, entries, exports, lookup, roots, translations
+from .routes.streaming import NEXT_CURSOR_HEADER
+from .services.cache import read_cache
+from .services.coalesce import single_flight
+from .services.export_jobs import export_queue
+from .services.metrics import MongoCommandMonitor, pool_monitor, registry
+from .services.snapshot import ReadOnlySnapshotError, Snapshot, snapshot_store
+from .services.sync import change_sync
+from .services.versions import collection_versions
+from .services.warmup import load_indexes, materialize_forms
+
+MongoDB.event_listeners = [pool_monitor, MongoCommandMonitor()]
+
+
+def pin_snapshot_versions(snapshot: Snapshot) -> None:
+    """Stamp both collections with the build time of the snapshot being served."""
+    for name in ("roots", "translations"):
+        collection_versions.pin(name, f"snapshot.{snapshot.meta['built_at']!r}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
+    if settings.snapshot_path:
+        # Read-only replica: serve roots and translations from the mapped snapshot, no MongoDB
+        snapshot = snapshot_store.open(settings.snapshot_path, settings.snapshot_check_seconds)
+        pin_snapshot_versions(snapshot)
+        snapshot_store.on_reload(pin_snapshot_versions)
+        print(f"Serving read-only from snapshot {settings.snapshot_path} ({snapshot.meta['counts']})")
+        yield
+        return
+
     await MongoDB.connect_db()
+    if prefork.primed:
+        # Forked from a master that already loaded everything; catch up from its sync position
+        change_sync.attach(get_db())
+    else:
+        await ensure_indexes(get_db())
+        if settings.index_diagnostics:
+            await verify_query_plans(get_db())
+        await materialize_forms(get_db())
+        await change_sync.prepare(get_db(), settings.sync_poll_seconds)
+        await load_indexes(get_db())
+    change_sync.start()
+    export_queue.configure(settings.export_dir, settings.export_max_concurrent, settings.export_ttl_seconds)
+    export_queue.start()
     yield
     # Shutdown
+    await export_queue.shutdown()
+    await change_sync.stop()
     await MongoDB.close_db()
 
 
@@ -32,11 +78,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.gzip_level,
+    brotli_quality=settings.brotli_quality,
+)
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(ReadOnlySnapshotError)
+async def read_only_snapshot_handler(request: Request, exc: ReadOnlySnapshotError):
+    """Reject writes while serving from a read-only snapshot."""
+    return JSONResponse(status_code=503, content={"detail": "This instance serves a read-only snapshot"})
+
 
 # Include routers
 app.include_router(roots.router, prefix="/api")
 app.include_router(translations.router, prefix="/api")
+app.include_router(lookup.router, prefix="/api")
+app.include_router(entries.router, prefix="/api")
+app.include_router(autocomplete.router, prefix="/api")
+app.include_router(exports.router, prefix="/api")
 
 
 @app.get("/")
@@ -53,3 +117,33 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness probe: pings MongoDB and reports connection pool statistics."""
+    if snapshot_store.enabled:
+        return {"status": "ready", "snapshot": snapshot_store.current().meta}
+    try:
+        latency = await MongoDB.ping()
+    except Exception as e:
+        response.status_code = 503
+        return {"status": "unavailable", "error": str(e), "pool": pool_monitor.stats()}
+    return {
+        "status": "ready",
+        "ping_ms": round(latency, 2),
+        "pool": pool_monitor.stats(),
+        "sync": change_sync.stats(),
+    }
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Read-through cache and request coalescing statistics."""
+    return {**read_cache.stats(), "coalescing": single_flight.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request and MongoDB metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,139 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+class _GzipCompressor:
+    """Incremental gzip compressor."""
+
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so streamed lines reach the client promptly."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and close the stream."""
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliCompressor:
+    """Incremental brotli compressor."""
+
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so streamed lines reach the client promptly."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and close the stream."""
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _accepted(accept_encoding: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}."""
+    codings = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            codings[coding.lower()] = q
+    return codings
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression for responses above a size threshold."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, accept_encoding: str):
+        """Pick the best supported coding the client accepts, or None."""
+        accepted = _accepted(accept_encoding)
+        wildcard = accepted.get("*", 0)
+        if brotli is not None and accepted.get("br", wildcard) > 0:
+            return lambda: _BrotliCompressor(self.brotli_quality)
+        if accepted.get("gzip", wildcard) > 0:
+            return lambda: _GzipCompressor(self.gzip_level)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        make_compressor = self._choose(Headers(scope=scope).get("accept-encoding", ""))
+
+        start_message = None
+        compressor: Optional[object] = None
+        passthrough = make_compressor is None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message["headers"]))
+                # The representation depends on Accept-Encoding, so shared caches must key on it
+                headers.add_vary_header("Accept-Encoding")
+                status = message["status"]
+                # Partial content must stay byte-identical to the ranges it claims
+                passthrough = passthrough or "content-encoding" in headers or status in (204, 206, 304)
+                etag = headers.get("etag")
+                encoded = make_compressor is not None and (not passthrough or status == 304)
+                if encoded and etag and not etag.startswith("W/"):
+                    # Compressed bytes differ from the identity ones; only weak comparison still holds
+                    headers["ETag"] = f"W/{etag}"
+                start_message = {**message, "headers": headers.raw}
+                if passthrough:
+                    await send(start_message)
+                    start_message = None
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                compressor = make_compressor()
+                headers["Content-Encoding"] = compressor.encoding
+                if more_body:
+                    del headers["Content-Length"]
+                    body = compressor.compress(body)
+                else:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                start_message = None
+            else:
+                body = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
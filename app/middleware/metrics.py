@@ -0,0 +1,55 @@
+import time
+
+from ..config.settings import settings
+from ..services.metrics import (
+    RequestTimings, http_in_flight, http_request_duration, http_response_size, request_timings,
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, in-flight requests and response sizes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        status = 500
+        size = 0
+        started = time.perf_counter()
+        http_in_flight.inc((method,))
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec((method,))
+            request_timings.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration.observe((method, route_path, str(status)), elapsed)
+            http_response_size.observe((method, route_path), size)
+            if settings.slow_request_ms and elapsed * 1000 >= settings.slow_request_ms:
+                _log_slow_request(method, scope.get("path", ""), status, elapsed, timings)
+
+
+def _log_slow_request(method: str, path: str, status: int, elapsed: float, timings: RequestTimings) -> None:
+    """Print a slow request with its time split by phase."""
+    phases = {"db": 0.0, "validation": 0.0, "serialization": 0.0, **timings.phases}
+    phases["other"] = max(0.0, elapsed - sum(phases.values()))
+    breakdown = ", ".join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in phases.items())
+    print(f"Slow request {method} {path} -> {status} in {elapsed * 1000:.1f}ms ({breakdown})")
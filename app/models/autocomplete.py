@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class Suggestion(BaseModel):
+    """One typeahead suggestion."""
+    text: str = Field(..., description="Stored value that matched the prefix")
+    slot: str = Field(..., description="Field holding the value, e.g. 'english' or 'verb_fields.inf_i'")
+    collection: Literal["translations", "roots"] = Field(..., description="Collection of the suggested entry")
+    id: str = Field(alias="_id")
+    headword: str = Field(..., description="Kelma word of a translation, or the root itself")
+    cat: Optional[str] = Field(None, description="Category of a translation; unset for roots")
+    english: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,65 @@
+from bson import ObjectId
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
+
+
+class BulkRowError(BaseModel):
+    """Error for a single row of a bulk import."""
+    row: int = Field(..., description="Zero-based position of the row in the input")
+    error: str = Field(..., description="Why the row was rejected")
+
+
+class BulkResult(BaseModel):
+    """Outcome of a bulk import."""
+    inserted: int = Field(0, description="Number of rows written")
+    errors: List[BulkRowError] = Field(default_factory=list, description="Rejected rows")
+
+
+class BatchResult(BaseModel):
+    """Entries changed by one batch operation."""
+    roots_updated: int = Field(0, description="Number of roots modified")
+    roots_deleted: int = Field(0, description="Number of roots removed")
+    translations_updated: int = Field(0, description="Number of translations modified")
+    translations_deleted: int = Field(0, description="Number of translations removed")
+
+
+class RootRename(BaseModel):
+    """New value for a root, cascaded to the translations derived from it."""
+    root: str = Field(..., min_length=1, description="New root text")
+
+
+class TranslationFilter(BaseModel):
+    """Translations a batch update applies to; at least one condition is required."""
+    ids: Optional[List[str]] = Field(None, description="Only these translation IDs")
+    cat: Optional[str] = None
+    swadesh: Optional[bool] = None
+    noun_type: Optional[str] = None
+    root: Optional[str] = None
+
+    @field_validator("ids")
+    @classmethod
+    def validate_ids(cls, v):
+        """Reject IDs that are not ObjectIds."""
+        if v is not None and not all(ObjectId.is_valid(doc_id) for doc_id in v):
+            raise ValueError("ids must be ObjectId strings")
+        return v
+
+    def to_query(self) -> Dict[str, Any]:
+        """MongoDB query for the filter."""
+        query: Dict[str, Any] = self.model_dump(exclude={"ids"}, exclude_none=True)
+        if self.ids is not None:
+            query["_id"] = {"$in": [ObjectId(doc_id) for doc_id in self.ids]}
+        return query
+
+
+class TranslationBatchUpdate(BaseModel):
+    """Fields a batch update may set on every matching translation."""
+    root: Optional[str] = None
+    swadesh: Optional[bool] = None
+    noun_type: Optional[Literal["primary", "radical", "deverbal"]] = None
+
+
+class TranslationPatch(BaseModel):
+    """Batch update of all translations matching a filter."""
+    filter: TranslationFilter
+    update: TranslationBatchUpdate
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+from .root import Root
+from .translation import Translation
+
+
+class Entry(BaseModel):
+    """A root together with the translations derived from it."""
+    root: Root
+    translations: List[Translation] = Field(default_factory=list)
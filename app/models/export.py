@@ -0,0 +1,23 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+ExportFormat = Literal["csv", "json", "markdown", "paradigms"]
+
+
+class ExportRequest(BaseModel):
+    """Export to generate in the background."""
+    format: ExportFormat = Field(..., description="csv, json, markdown (dictionary) or paradigms (inflection tables)")
+
+
+class ExportJob(BaseModel):
+    """State of a background export."""
+    id: str
+    format: ExportFormat
+    status: Literal["queued", "running", "done", "failed"] = "queued"
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows: int = Field(0, description="Entries written so far")
+    size: Optional[int] = Field(None, description="File size in bytes once done")
+    error: Optional[str] = None
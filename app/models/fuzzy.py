@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+from .root import Root
+from .translation import Translation
+
+
+class FuzzyMatch(BaseModel):
+    """An entry with a term within a few edits of the query."""
+    distance: int = Field(..., description="Edits (insertions, deletions, substitutions, transpositions) from the query")
+    term: str = Field(..., description="Normalized term that matched")
+    slot: Literal["kelma", "english", "root"] = Field(..., description="Field holding the term")
+    collection: Literal["translations", "roots"] = Field(..., description="Collection of the matching entry")
+    translation: Optional[Translation] = None
+    root: Optional[Root] = None
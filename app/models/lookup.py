@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+from .root import Root
+from .translation import Translation
+
+
+class LookupMatch(BaseModel):
+    """An entry that has the looked-up form in one of its slots."""
+    collection: Literal["translations", "roots"] = Field(..., description="Collection of the matching entry")
+    slot: str = Field(..., description="Field holding the form, e.g. 'noun_fields.erg_plural'")
+    translation: Optional[Translation] = None
+    root: Optional[Root] = None
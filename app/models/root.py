@@ -67,7 +67,20 @@ class RootUpdate(BaseModel):
 class Root(RootBase):
     """Model for Root with ID."""
     id: str = Field(alias="_id")
-    
+
+    @classmethod
+    def from_mongo(cls, document: dict) -> "Root":
+        """Build a Root from a stored document without re-running validation.
+
+        Documents were validated when written, so reads skip validation entirely.
+        """
+        mode = document["mode"]
+        modes = {
+            name: ModeFields.model_construct(**mode[name]) if mode.get(name) is not None else None
+            for name in ("base", "long", "strong")
+        }
+        return cls.model_construct(**{**document, "_id": str(document["_id"]), "mode": ModeData.model_construct(**modes)})
+
     class Config:
         populate_by_name = True
         json_encoders = {
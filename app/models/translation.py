@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional, Literal
+from typing import Dict, Optional, Literal
 from bson import ObjectId
 
 
@@ -90,8 +90,29 @@ class Translation(TranslationBase):
     """Model for Translation with ID."""
     id: str = Field(alias="_id")
 
+    @classmethod
+    def from_mongo(cls, document: dict) -> "Translation":
+        """Build a Translation from a stored document without re-running validation.
+
+        Documents were validated when written, so reads skip validation entirely.
+        """
+        data = {**document, "_id": str(document["_id"])}
+        if data.get("noun_fields") is not None:
+            data["noun_fields"] = NounFields.model_construct(**data["noun_fields"])
+        if data.get("verb_fields") is not None:
+            data["verb_fields"] = VerbFields.model_construct(**data["verb_fields"])
+        return cls.model_construct(**data)
+
     class Config:
         populate_by_name = True
         json_encoders = {
             ObjectId: str
         }
+
+
+class TranslationFacets(BaseModel):
+    """Counts of translations per filterable value."""
+    total: int = Field(..., description="Number of matching translations")
+    cat: Dict[str, int] = Field(default_factory=dict, description="Count per category")
+    swadesh: Dict[str, int] = Field(default_factory=dict, description="Count per Swadesh membership ('true'/'false')")
+    noun_type: Dict[str, int] = Field(default_factory=dict, description="Count per noun type")
@@ -0,0 +1,52 @@
+"""Warm-up run once in a pre-forking server's master process, before workers are forked."""
+import asyncio
+import gc
+
+from .config.database import MongoDB, get_db
+from .config.indexes import ensure_indexes, verify_query_plans
+from .config.settings import settings
+from .services.metrics import pool_monitor
+from .services.sync import change_sync
+from .services.warmup import load_indexes, materialize_forms
+
+# Set once the in-process state has been loaded in the master; forked workers then skip the load
+primed = False
+
+
+async def _prime() -> None:
+    """Prepare the database and load the in-process indexes over a short-lived connection."""
+    await MongoDB.connect_db()
+    try:
+        db = get_db()
+        await ensure_indexes(db)
+        if settings.index_diagnostics:
+            await verify_query_plans(db)
+        await materialize_forms(db)
+        await change_sync.prepare(db, settings.sync_poll_seconds)
+        await load_indexes(db)
+    finally:
+        # Sockets and monitor threads must not be shared with forked workers
+        await MongoDB.close_db()
+        MongoDB.client = None
+
+
+def prime() -> None:
+    """Load the in-process state so every worker starts from a copy of it."""
+    global primed
+    if settings.snapshot_path:
+        # Snapshots are mapped per worker and shared through the page cache already
+        return
+    # State from a previous load is garbage once replaced; let the collector see it again
+    gc.unfreeze()
+    asyncio.run(_prime())
+    primed = True
+    # Move everything loaded so far out of the collector's reach: its passes would
+    # otherwise write to every object and un-share the workers' copy-on-write pages
+    gc.collect()
+    gc.freeze()
+
+
+def after_fork() -> None:
+    """Reset per-process state inherited from the master."""
+    MongoDB.client = None
+    pool_monitor.reset()
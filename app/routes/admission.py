@@ -0,0 +1,91 @@
+import math
+import time
+from typing import AsyncIterator
+import pymongo
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+from pymongo.errors import PyMongoError
+
+from ..config.settings import settings
+from ..services.admission import admission
+from ..services.metrics import admission_rejected
+
+
+def _reject(route: str, status_code: int, reason: str, detail: str, retry_after: float) -> HTTPException:
+    """Count a turned-away request and build its response."""
+    admission_rejected.inc((route, reason))
+    return HTTPException(
+        status_code=status_code, detail=detail, headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class Admitted:
+    """An admitted request's slot and deadline, which a streamed response can take over."""
+
+    def __init__(self, limiter, deadline: float):
+        self.streaming = False
+        self._limiter = limiter
+        self._deadline = deadline
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline."""
+        return self._deadline - time.monotonic()
+
+    def stream(self, items: AsyncIterator[BaseModel]) -> AsyncIterator[BaseModel]:
+        """Keep the slot and deadline until the items are exhausted or the client goes away."""
+        self.streaming = True
+        return self._hold(items)
+
+    async def _hold(self, items: AsyncIterator[BaseModel]) -> AsyncIterator[BaseModel]:
+        """Produce the items under the deadline, releasing the slot afterwards."""
+        try:
+            with pymongo.timeout(max(self.remaining(), 0.001)):
+                async for item in items:
+                    yield item
+        finally:
+            self._limiter.release()
+
+
+def admit(route: str):
+    """Build a dependency that admits an expensive request under the route's limits.
+
+    Clients over their rate get `429`; when the route's queue is full or no slot
+    frees up within the queue timeout the request gets `503`. Admitted requests
+    run their MongoDB queries under what is left of the deadline (`maxTimeMS`).
+    The dependency's exit runs before a streamed body is sent, so streaming routes
+    hand their items to `Admitted.stream`, which holds the slot and deadline
+    until the stream ends.
+    """
+    async def dependency(request: Request) -> AsyncIterator[Admitted]:
+        arrived = time.monotonic()
+        if admission.rate_limits.enabled:
+            client = admission.proxies.client(
+                request.client.host if request.client else None, request.headers.get("x-forwarded-for")
+            )
+            wait = admission.rate_limits.take(client)
+            if wait:
+                raise _reject(route, 429, "rate_limited", "Too many requests", wait)
+
+        limiter = admission.limiter(route)
+        deadline = settings.admission_deadline_seconds
+        if not await limiter.acquire(min(settings.admission_queue_timeout_seconds, deadline)):
+            raise _reject(route, 503, "busy", "Server busy", settings.admission_queue_timeout_seconds)
+        admitted = Admitted(limiter, arrived + deadline)
+        handed_over = False
+        try:
+            remaining = admitted.remaining()
+            if remaining <= 0:
+                raise _reject(route, 503, "deadline", "Server busy", settings.admission_queue_timeout_seconds)
+            with pymongo.timeout(remaining):
+                yield admitted
+            handed_over = admitted.streaming
+        except PyMongoError as e:
+            if not e.timeout:
+                raise
+            raise _reject(
+                route, 503, "deadline", "Query exceeded its time budget", settings.admission_queue_timeout_seconds
+            )
+        finally:
+            if not handed_over:
+                limiter.release()
+    return dependency
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List
+
+from ..models.autocomplete import Suggestion
+from ..services.autocomplete_service import AutocompleteService
+from ..services.snapshot import snapshot_store
+from .etag import collection_etag
+from .responses import json_response
+
+router = APIRouter(prefix="/autocomplete", tags=["autocomplete"])
+autocomplete_etag = collection_etag("roots", "translations")
+
+
+def get_autocomplete_service() -> AutocompleteService:
+    """Dependency to get AutocompleteService instance."""
+    return AutocompleteService()
+
+
+@router.get("", response_model=List[Suggestion], dependencies=[Depends(autocomplete_etag)])
+async def autocomplete(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    service: AutocompleteService = Depends(get_autocomplete_service)
+):
+    """Suggest entries whose kelma, english, root or inflected form starts with the prefix."""
+    if snapshot_store.enabled:
+        raise HTTPException(status_code=501, detail="Autocomplete is not available in snapshot mode")
+    if not service.ready:
+        raise HTTPException(status_code=503, detail="Autocomplete index is loading")
+    return json_response(service.complete(q, limit), List[Suggestion], response)
@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..config.database import DatabaseUnavailable
+from ..config.database import get_db as _get_db
+from ..services.batch_service import BatchService
+from ..services.snapshot import ReadOnlySnapshotError, snapshot_store
+
+
+def get_db() -> AsyncIOMotorDatabase:
+    """Dependency to get the database instance; 503 while serving a read-only snapshot."""
+    try:
+        return _get_db()
+    except DatabaseUnavailable:
+        raise HTTPException(status_code=503, detail="Database not available in read-only snapshot mode")
+
+
+def get_batch_service() -> BatchService:
+    """Dependency to get BatchService instance; there is none in read-only mode."""
+    if snapshot_store.enabled:
+        raise ReadOnlySnapshotError()
+    return BatchService(get_db())
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query, Response
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..models.entry import Entry
+from ..services.entry_service import EntryService
+from .admission import admit
+from .dependencies import get_db
+from .etag import collection_etag
+from .responses import json_response
+
+router = APIRouter(prefix="/entries", tags=["entries"])
+entries_etag = collection_etag("roots", "translations")
+
+
+def get_entry_service(db: AsyncIOMotorDatabase = Depends(get_db)) -> EntryService:
+    """Dependency to get EntryService instance."""
+    return EntryService(db)
+
+
+@router.get("", response_model=List[Entry], dependencies=[Depends(entries_etag), Depends(admit("entries"))])
+async def get_entries(
+    response: Response,
+    root: Optional[List[str]] = Query(None, description="Root values to fetch (repeatable); all roots when omitted"),
+    service: EntryService = Depends(get_entry_service)
+):
+    """Get roots together with their translations in one request."""
+    return json_response(await service.get_entries(root), List[Entry], response)
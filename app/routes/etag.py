@@ -0,0 +1,33 @@
+import hashlib
+from fastapi import HTTPException, Request, Response
+
+from ..services.versions import collection_versions
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, using weak comparison (RFC 9110)."""
+    tags = [_opaque(tag.strip()) for tag in if_none_match.split(",")]
+    return "*" in tags or _opaque(etag) in tags
+
+
+def _opaque(tag: str) -> str:
+    """An entity tag without its weakness indicator."""
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def collection_etag(*collections: str):
+    """Build a dependency that tags responses with the version of the given collections.
+
+    When the client's If-None-Match is current, the request is answered with
+    `304 Not Modified` before the endpoint queries or serializes anything.
+    """
+    async def dependency(request: Request, response: Response) -> str:
+        stamps = ",".join(collection_versions.stamp(collection) for collection in collections)
+        key = f"{request.url.path}?{request.url.query}|{stamps}"
+        etag = f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+    return dependency
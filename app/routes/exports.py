@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from ..models.export import ExportJob, ExportRequest
+from ..services.export_jobs import export_queue
+from .dependencies import get_db
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.post("", response_model=ExportJob, status_code=202)
+async def create_export(export: ExportRequest, request: Request, response: Response):
+    """Start generating an export in the background; poll the returned job for its status."""
+    job = export_queue.submit(get_db(), export.format)
+    response.headers["Location"] = str(request.url_for("get_export", job_id=job.id))
+    return job
+
+
+@router.get("/{job_id}", response_model=ExportJob)
+async def get_export(job_id: str):
+    """Get the status of an export."""
+    job = export_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+@router.get("/{job_id}/download")
+async def download_export(job_id: str):
+    """Download a finished export; supports Range requests for resuming."""
+    job = export_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    path = export_queue.path(job_id)
+    if path is None:
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+    return FileResponse(path, media_type=export_queue.media_type(job_id), filename=export_queue.filename(job_id))
+
+
+@router.delete("/{job_id}", status_code=204)
+async def delete_export(job_id: str):
+    """Cancel an export or delete its file."""
+    if not await export_queue.remove(job_id):
+        raise HTTPException(status_code=404, detail="Export not found")
+    return None
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..models.lookup import LookupMatch
+from ..services.lookup_service import LookupService
+from .dependencies import get_db
+from .responses import json_response
+
+router = APIRouter(prefix="/lookup", tags=["lookup"])
+
+
+def get_lookup_service(db: AsyncIOMotorDatabase = Depends(get_db)) -> LookupService:
+    """Dependency to get LookupService instance."""
+    return LookupService(db)
+
+
+@router.get("/{form}", response_model=List[LookupMatch])
+async def lookup_form(
+    form: str,
+    service: LookupService = Depends(get_lookup_service)
+):
+    """Find the translations and roots that have this word form, and which slot matched."""
+    return json_response(await service.lookup(form), List[LookupMatch])
@@ -0,0 +1,56 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Type
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from pydantic import TypeAdapter
+from pymongo import ASCENDING, DESCENDING
+
+from ..services.metrics import timed
+
+
+@lru_cache(maxsize=None)
+def _adapter(model_type: Any) -> TypeAdapter:
+    """Shared TypeAdapter per response type."""
+    return TypeAdapter(model_type)
+
+
+def json_response(content: Any, model_type: Any, response: Optional[Response] = None) -> Response:
+    """Render trusted models straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model re-validation; the
+    decorator's response_model still documents the schema. Headers set by
+    dependencies on `response` are carried over.
+    """
+    headers = dict(response.headers) if response is not None else None
+    with timed("serialization"):
+        body = _adapter(model_type).dump_json(content, by_alias=True)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """Turn a comma-separated `fields=` parameter into a validated projection list."""
+    if fields is None:
+        return None
+    allowed = set(model.model_fields) - {"id"}
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested",
+        )
+    return requested
+
+
+def parse_sort(sort: Optional[str], allowed: Tuple[str, ...]) -> Optional[Tuple[str, int]]:
+    """Turn a `sort=` parameter such as `kelma` or `-english` into a (field, direction) pair."""
+    if sort is None:
+        return None
+    field = sort.lstrip("-")
+    if field not in allowed:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {field}; use one of: {', '.join(allowed)}")
+    return field, DESCENDING if sort.startswith("-") else ASCENDING
@@ -1,36 +1,90 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from typing import Any, Dict, List, Optional, Union
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
+from ..models.bulk import BatchResult, BulkResult, RootRename
 from ..models.root import Root, RootCreate, RootUpdate
+from ..services.batch_service import BatchService, Dependents
 from ..services.root_service import RootService
-from ..config.database import get_db
+from ..services.snapshot import snapshot_store
+from ..services.snapshot_service import SnapshotRootService
+from .admission import Admitted, admit
+from .dependencies import get_batch_service, get_db
+from .etag import collection_etag
+from .responses import json_response, parse_fields
+from .streaming import ndjson_download, ndjson_response, read_rows, set_next_cursor, validate_cursor
 
 router = APIRouter(prefix="/roots", tags=["roots"])
-
-
-def get_root_service(db: AsyncIOMotorDatabase = Depends(get_db)) -> RootService:
-    """Dependency to get RootService instance."""
-    return RootService(db)
-
-
-@router.get("", response_model=List[Root])
-async def get_all_roots(service: RootService = Depends(get_root_service)):
-    """Get all roots."""
-    return await service.get_all()
-
-
-@router.get("/search", response_model=List[Root])
+roots_etag = collection_etag("roots")
+
+
+def get_root_service() -> RootService:
+    """Dependency to get RootService instance, backed by the snapshot in read-only mode."""
+    if snapshot_store.enabled:
+        return SnapshotRootService(snapshot_store)
+    return RootService(get_db())
+
+
+@router.get(
+    "", response_model=Union[List[Root], List[Dict[str, Any]]],
+    dependencies=[Depends(roots_etag)],
+)
+async def get_all_roots(
+    response: Response,
+    after: Optional[str] = Query(None, description="Return roots after this ID (keyset cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of roots per page"),
+    stream: bool = Query(False, description="Stream roots as NDJSON instead of a JSON array"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. 'root'"),
+    etag: str = Depends(roots_etag),
+    admitted: Admitted = Depends(admit("roots.list")),
+    service: RootService = Depends(get_root_service)
+):
+    """Get all roots, optionally paginated, projected or streamed."""
+    validate_cursor(after)
+    projection = parse_fields(fields, Root)
+    if stream:
+        if projection:
+            raise HTTPException(status_code=400, detail="fields cannot be combined with stream")
+        return ndjson_response(admitted.stream(service.iter_all(after=after, limit=limit)), headers={"ETag": etag})
+    if projection:
+        roots = await service.get_all_fields(projection, after=after, limit=limit)
+        set_next_cursor(response, roots, limit)
+        return json_response(roots, List[dict], response)
+    roots = await service.get_all(after=after, limit=limit)
+    set_next_cursor(response, roots, limit)
+    return json_response(roots, List[Root], response)
+
+
+@router.get("/search", response_model=List[Root], dependencies=[Depends(roots_etag), Depends(admit("roots.search"))])
 async def search_roots(
+    response: Response,
     q: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
+    service: RootService = Depends(get_root_service)
+):
+    """Search roots by root text or primary meaning, best matches first."""
+    return json_response(await service.search(q, limit), List[Root], response)
+
+
+@router.get("/export")
+async def export_roots(
+    admitted: Admitted = Depends(admit("roots.export")),
     service: RootService = Depends(get_root_service)
 ):
-    """Search roots by root text or primary meaning."""
-    return await service.search(q)
+    """Export all roots as an NDJSON download suitable for re-import."""
+    return ndjson_download(admitted.stream(service.iter_all(batch_size=1000)), "roots.ndjson")
 
 
-@router.get("/by-value/{root_value}", response_model=Root)
+@router.post("/bulk", response_model=BulkResult)
+async def import_roots(request: Request, service: RootService = Depends(get_root_service)):
+    """Import roots from a JSON array or an NDJSON stream, reporting per-row errors."""
+    return await service.create_many(read_rows(request))
+
+
+@router.get("/by-value/{root_value}", response_model=Root, dependencies=[Depends(roots_etag)])
 async def get_root_by_value(
+    response: Response,
     root_value: str,
     service: RootService = Depends(get_root_service)
 ):
@@ -38,7 +92,7 @@ async def get_root_by_value(
     root = await service.get_by_root_value(root_value)
     if not root:
         raise HTTPException(status_code=404, detail="Root not found")
-    return root
+    return json_response(root, Root, response)
 
 
 @router.get("/{root_id}", response_model=Root)
@@ -50,7 +104,7 @@ async def get_root(
     root = await service.get_by_id(root_id)
     if not root:
         raise HTTPException(status_code=404, detail="Root not found")
-    return root
+    return json_response(root, Root)
 
 
 @router.post("", response_model=Root, status_code=201)
@@ -59,7 +113,10 @@ async def create_root(
     service: RootService = Depends(get_root_service)
 ):
     """Create a new root."""
-    return await service.create(root_data)
+    try:
+        return await service.create(root_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=f"Root {root_data.root} already exists")
 
 
 @router.put("/{root_id}", response_model=Root)
@@ -69,19 +126,51 @@ async def update_root(
     service: RootService = Depends(get_root_service)
 ):
     """Update a root by ID."""
-    root = await service.update(root_id, root_data)
+    try:
+        root = await service.update(root_id, root_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=f"Root {root_data.root} already exists")
     if not root:
         raise HTTPException(status_code=404, detail="Root not found")
     return root
 
 
-@router.delete("/{root_id}", status_code=204)
+@router.delete("/{root_id}", status_code=204, responses={200: {"model": BatchResult}})
 async def delete_root(
     root_id: str,
-    service: RootService = Depends(get_root_service)
+    dependents: Optional[Dependents] = Query(
+        None, description="Also keep, detach or delete the root's translations, in one transaction"
+    ),
+    service: RootService = Depends(get_root_service),
+    batch_service: BatchService = Depends(get_batch_service)
 ):
-    """Delete a root by ID."""
+    """Delete a root by ID, optionally together with its translations."""
+    if dependents is not None:
+        if not ObjectId.is_valid(root_id):
+            raise HTTPException(status_code=404, detail="Root not found")
+        result = await batch_service.delete_root(root_id, dependents)
+        if not result:
+            raise HTTPException(status_code=404, detail="Root not found")
+        return json_response(result, BatchResult)
     success = await service.delete(root_id)
     if not success:
         raise HTTPException(status_code=404, detail="Root not found")
     return None
+
+
+@router.post("/{root_id}/rename", response_model=BatchResult)
+async def rename_root(
+    root_id: str,
+    rename: RootRename,
+    service: BatchService = Depends(get_batch_service)
+):
+    """Rename a root and its translations' `root` references in one transaction."""
+    if not ObjectId.is_valid(root_id):
+        raise HTTPException(status_code=404, detail="Root not found")
+    try:
+        result = await service.rename_root(root_id, rename.root)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=f"Root {rename.root} already exists")
+    if not result:
+        raise HTTPException(status_code=404, detail="Root not found")
+    return result
@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from typing import Any, AsyncIterator, Optional, Tuple, Union
+from bson import ObjectId
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def validate_cursor(after: Optional[str]) -> None:
+    """Reject pagination cursors that are not valid ObjectIds."""
+    if after is not None and not ObjectId.is_valid(after):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_cursor(after: Optional[str], sort: Optional[Tuple[str, int]]) -> Optional[Union[str, Tuple[str, str]]]:
+    """Decode an `after` cursor: an ID in `_id` order, a (sort value, ID) pair in any other order.
+
+    Sort fields hold strings; anything else, such as a query operator, is rejected.
+    """
+    if after is None or sort is None or sort[0] == "_id":
+        validate_cursor(after)
+        return after
+    try:
+        value, doc_id = json.loads(base64.urlsafe_b64decode(after.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(value, str) or not isinstance(doc_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    validate_cursor(doc_id)
+    return value, doc_id
+
+
+def set_next_cursor(
+    response: Response, items: list, limit: Optional[int], sort: Optional[Tuple[str, int]] = None
+) -> None:
+    """Advertise the cursor of the next page when the current page is full.
+
+    Outside `_id` order the cursor carries the last sort value and `_id`, the tie-breaker.
+    """
+    if limit and len(items) == limit:
+        last = items[-1]
+        doc_id = last["_id"] if isinstance(last, dict) else last.id
+        if sort is None or sort[0] == "_id":
+            response.headers[NEXT_CURSOR_HEADER] = doc_id
+            return
+        value = last.get(sort[0]) if isinstance(last, dict) else getattr(last, sort[0])
+        response.headers[NEXT_CURSOR_HEADER] = base64.urlsafe_b64encode(json.dumps([value, doc_id]).encode()).decode()
+
+
+async def _ndjson_lines(items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    """Encode each model as one JSON line as soon as it is produced."""
+    async for item in items:
+        yield item.model_dump_json(by_alias=True).encode() + b"\n"
+
+
+def ndjson_response(items: AsyncIterator[BaseModel], headers: Optional[dict] = None) -> StreamingResponse:
+    """Stream models to the client as newline-delimited JSON."""
+    return StreamingResponse(_ndjson_lines(items), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+async def read_rows(request: Request) -> AsyncIterator[Any]:
+    """Yield the rows of a JSON array body, or the raw lines of an NDJSON body as they arrive."""
+    if request.headers.get("content-type", "").split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for row in rows:
+        yield row
+
+
+def ndjson_download(items: AsyncIterator[BaseModel], filename: str) -> StreamingResponse:
+    """Stream models as an NDJSON file download."""
+    return ndjson_response(items, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
@@ -1,35 +1,123 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List
-from motor.motor_asyncio import AsyncIOMotorDatabase
-
-from ..models.translation import Translation, TranslationCreate, TranslationUpdate
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from typing import Any, Dict, List, Optional, Union
+
+from ..config.settings import settings
+from ..models.bulk import BatchResult, BulkResult, TranslationPatch
+from ..models.fuzzy import FuzzyMatch
+from ..models.translation import Translation, TranslationCreate, TranslationFacets, TranslationUpdate
+from ..services.batch_service import BatchService
+from ..services.fuzzy_service import FuzzyService
 from ..services.translation_service import TranslationService
-from ..config.database import get_db
+from ..services.snapshot import snapshot_store
+from ..services.snapshot_service import SnapshotTranslationService
+from .admission import Admitted, admit
+from .dependencies import get_batch_service, get_db
+from .etag import collection_etag
+from .responses import json_response, parse_fields, parse_sort
+from .streaming import ndjson_download, ndjson_response, parse_cursor, read_rows, set_next_cursor
 
 router = APIRouter(prefix="/translations", tags=["translations"])
+translations_etag = collection_etag("translations")
+fuzzy_etag = collection_etag("roots", "translations")
+
+SORT_FIELDS = ("_id", "kelma", "english")
+
+
+def get_translation_service() -> TranslationService:
+    """Dependency to get TranslationService instance, backed by the snapshot in read-only mode."""
+    if snapshot_store.enabled:
+        return SnapshotTranslationService(snapshot_store)
+    return TranslationService(get_db())
 
 
-def get_translation_service(db: AsyncIOMotorDatabase = Depends(get_db)) -> TranslationService:
-    """Dependency to get TranslationService instance."""
-    return TranslationService(db)
+def get_fuzzy_service() -> FuzzyService:
+    """Dependency to get FuzzyService instance."""
+    return FuzzyService()
 
 
-@router.get("/search", response_model=List[Translation])
+def get_translation_filters(
+    cat: Optional[str] = Query(None, description="Only translations of this category"),
+    swadesh: Optional[bool] = Query(None, description="Only translations on (or off) the Swadesh list"),
+    noun_type: Optional[str] = Query(None, description="Only nouns of this type"),
+    root: Optional[str] = Query(None, description="Only translations derived from this root"),
+) -> dict:
+    """Equality filters on indexed translation fields, from query parameters."""
+    filters = {"cat": cat, "swadesh": swadesh, "noun_type": noun_type, "root": root}
+    return {field: value for field, value in filters.items() if value is not None}
+
+
+@router.get(
+    "/search", response_model=List[Translation],
+    dependencies=[Depends(translations_etag), Depends(admit("translations.search"))],
+)
 async def search_translations(
+    response: Response,
     q: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
     service: TranslationService = Depends(get_translation_service)
 ):
-    """Search translations by kelma, english, or root."""
-    return await service.search(q)
+    """Search translations by kelma, english, or root, best matches first."""
+    return json_response(await service.search(q, limit), List[Translation], response)
+
+
+@router.get("/fuzzy", response_model=List[FuzzyMatch], dependencies=[Depends(fuzzy_etag)])
+async def fuzzy_search_translations(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Possibly misspelled word"),
+    max_distance: int = Query(
+        settings.fuzzy_max_distance, ge=0, le=settings.fuzzy_max_distance,
+        description="Largest number of edits to tolerate",
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
+    service: FuzzyService = Depends(get_fuzzy_service)
+):
+    """Find translations (by kelma or english word) and roots within a few typos of the query, closest first.
 
+    Not available when serving a snapshot, which carries no deletion dictionary.
+    """
+    if snapshot_store.enabled:
+        raise HTTPException(status_code=501, detail="Fuzzy search is not available in snapshot mode")
+    if not service.ready:
+        raise HTTPException(status_code=503, detail="Fuzzy index is loading")
+    return json_response(service.search(q, max_distance, limit), List[FuzzyMatch], response)
 
-@router.get("/by-root/{root}", response_model=List[Translation])
+
+@router.get("/by-root/{root}", response_model=List[Translation], dependencies=[Depends(translations_etag)])
 async def get_translations_by_root(
+    response: Response,
     root: str,
     service: TranslationService = Depends(get_translation_service)
 ):
     """Get all translations for a specific root."""
-    return await service.get_by_root(root)
+    return json_response(await service.get_by_root(root), List[Translation], response)
+
+
+@router.get("/export")
+async def export_translations(
+    admitted: Admitted = Depends(admit("translations.export")),
+    service: TranslationService = Depends(get_translation_service)
+):
+    """Export all translations as an NDJSON download suitable for re-import."""
+    return ndjson_download(admitted.stream(service.iter_all(batch_size=1000)), "translations.ndjson")
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def import_translations(request: Request, service: TranslationService = Depends(get_translation_service)):
+    """Import translations from a JSON array or an NDJSON stream, reporting per-row errors."""
+    return await service.create_many(read_rows(request))
+
+
+@router.get(
+    "/facets", response_model=TranslationFacets,
+    dependencies=[Depends(translations_etag), Depends(admit("translations.facets"))],
+)
+async def get_translation_facets(
+    response: Response,
+    filters: dict = Depends(get_translation_filters),
+    service: TranslationService = Depends(get_translation_service)
+):
+    """Count matching translations per category, Swadesh membership and noun type."""
+    return json_response(await service.get_facets(tuple(sorted(filters.items()))), TranslationFacets, response)
 
 
 @router.get("/{translation_id}", response_model=Translation)
@@ -41,13 +129,49 @@ async def get_translation(
     translation = await service.get_by_id(translation_id)
     if not translation:
         raise HTTPException(status_code=404, detail="Translation not found")
-    return translation
-
-
-@router.get("", response_model=List[Translation])
-async def get_all_translations(service: TranslationService = Depends(get_translation_service)):
-    """Get all translations."""
-    return await service.get_all()
+    return json_response(translation, Translation)
+
+
+@router.get(
+    "", response_model=Union[List[Translation], List[Dict[str, Any]]],
+    dependencies=[Depends(translations_etag)],
+)
+async def get_all_translations(
+    response: Response,
+    after: Optional[str] = Query(None, description="Return translations after this cursor (from X-Next-Cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of translations per page"),
+    stream: bool = Query(False, description="Stream translations as NDJSON instead of a JSON array"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. 'kelma,english,cat'"),
+    sort: Optional[str] = Query(None, description="Sort by _id, kelma or english; prefix with '-' for descending"),
+    filters: dict = Depends(get_translation_filters),
+    etag: str = Depends(translations_etag),
+    admitted: Admitted = Depends(admit("translations.list")),
+    service: TranslationService = Depends(get_translation_service)
+):
+    """Get all translations, optionally filtered, sorted, paginated, projected or streamed."""
+    projection = parse_fields(fields, Translation)
+    order = parse_sort(sort, SORT_FIELDS)
+    cursor = parse_cursor(after, order)
+    if stream:
+        if projection:
+            raise HTTPException(status_code=400, detail="fields cannot be combined with stream")
+        return ndjson_response(
+            admitted.stream(service.iter_all(after=cursor, limit=limit, filters=filters, sort=order)),
+            headers={"ETag": etag},
+        )
+    if projection:
+        # The next cursor needs the sort value even when it was not requested
+        hidden = order[0] if order and order[0] != "_id" and order[0] not in projection else None
+        translations = await service.get_all_fields(
+            projection + [hidden] if hidden else projection, after=cursor, limit=limit, filters=filters, sort=order
+        )
+        set_next_cursor(response, translations, limit, order)
+        if hidden:
+            translations = [{key: value for key, value in doc.items() if key != hidden} for doc in translations]
+        return json_response(translations, List[dict], response)
+    translations = await service.get_all(after=cursor, limit=limit, filters=filters, sort=order)
+    set_next_cursor(response, translations, limit, order)
+    return json_response(translations, List[Translation], response)
 
 
 @router.post("", response_model=Translation, status_code=201)
@@ -59,6 +183,19 @@ async def create_translation(
     return await service.create(translation_data)
 
 
+@router.patch("", response_model=BatchResult)
+async def patch_translations(
+    patch: TranslationPatch,
+    service: BatchService = Depends(get_batch_service)
+):
+    """Set the same fields on every translation matching a filter, in one transaction."""
+    if not patch.filter.to_query():
+        raise HTTPException(status_code=400, detail="filter needs at least one condition")
+    if not patch.update.model_dump(exclude_none=True):
+        raise HTTPException(status_code=400, detail="update sets no fields")
+    return await service.patch_translations(patch)
+
+
 @router.put("/{translation_id}", response_model=Translation)
 async def update_translation(
     translation_id: str,
@@ -0,0 +1,179 @@
+import asyncio
+import ipaddress
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from ..config.settings import settings
+from .metrics import admission_active, admission_queued
+
+# Client buckets are pruned once there are more than this many
+_MAX_BUCKETS = 10000
+
+
+class TokenBuckets:
+    """Per-client token buckets: each client may make `rate` requests per second, bursting to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are rate limited at all."""
+        return self.rate > 0
+
+    def take(self, client: str) -> float:
+        """Spend a token; returns 0 when allowed, otherwise the seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            return (1 - tokens) / self.rate
+        self._buckets[client] = (tokens - 1, now)
+        if len(self._buckets) > _MAX_BUCKETS:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        """Forget clients whose buckets have refilled completely."""
+        refill_seconds = self.burst / self.rate
+        for client, (_, updated) in list(self._buckets.items()):
+            if now - updated >= refill_seconds:
+                del self._buckets[client]
+
+
+class TrustedProxies:
+    """Proxies allowed to name the client in `X-Forwarded-For`, from a comma-separated list of networks."""
+
+    def __init__(self, value: str):
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        self.any = "*" in items
+        self._networks: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = [
+            ipaddress.ip_network(item, strict=False) for item in items if item != "*"
+        ]
+
+    def trusts(self, address: str) -> bool:
+        """Whether an address belongs to a trusted proxy."""
+        if self.any:
+            return True
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self._networks)
+
+    def client(self, peer: Optional[str], forwarded_for: Optional[str]) -> str:
+        """Address of the client: the nearest `X-Forwarded-For` hop not added by a trusted proxy.
+
+        Hops are read from the right, since only those appended by trusted proxies are
+        reliable; anything further left was supplied by the client itself.
+        """
+        if peer is None:
+            return "unknown"
+        if not forwarded_for or not self.trusts(peer):
+            return peer
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self.trusts(hop):
+                return hop
+        return hops[0] if hops else peer
+
+
+class ConcurrencyLimiter:
+    """Runs at most `max_concurrent` requests at once, with up to `queue_size` more waiting in arrival order."""
+
+    def __init__(self, name: str, max_concurrent: int, queue_size: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to `timeout` seconds in the queue; False when none was free in time."""
+        if self.active < self.max_concurrent and not self._waiters:
+            self._started()
+            return True
+        if len(self._waiters) >= self.queue_size or timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        admission_queued.inc((self.name,))
+        admitted = False
+        try:
+            await asyncio.wait([waiter], timeout=timeout)
+            admitted = waiter.done()
+        finally:
+            admission_queued.dec((self.name,))
+            if not admitted:
+                if waiter.done():
+                    # Handed a slot just as the caller went away; pass it on
+                    self.release()
+                else:
+                    waiter.cancel()
+                    self._waiters.remove(waiter)
+        return admitted
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the longest-waiting request if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+        admission_active.dec((self.name,))
+
+    def _started(self) -> None:
+        """Count a request that took a free slot."""
+        self.active += 1
+        admission_active.inc((self.name,))
+
+
+class AdmissionControl:
+    """Concurrency limiters per expensive route, and the per-client rate limit in front of them.
+
+    All of it is per process: with several workers the server admits that many times more.
+    """
+
+    def __init__(
+        self, max_concurrent: int, queue_size: int, route_limits: str, rate: float, burst: int, proxies: str
+    ):
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.route_limits = _parse_route_limits(route_limits)
+        self.rate_limits = TokenBuckets(rate, burst)
+        self.proxies = TrustedProxies(proxies)
+        self._limiters: Dict[str, ConcurrencyLimiter] = {}
+
+    def limiter(self, name: str) -> ConcurrencyLimiter:
+        """The limiter of a route, created with its configured limits on first use."""
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            max_concurrent, queue_size = self.route_limits.get(name, (self.max_concurrent, self.queue_size))
+            limiter = self._limiters[name] = ConcurrencyLimiter(name, max_concurrent, queue_size)
+        return limiter
+
+
+def _parse_route_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "name=concurrency:queue,..." overrides."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, limit = item.partition("=")
+        concurrency, _, queue = limit.partition(":")
+        limits[name.strip()] = (int(concurrency), int(queue or 0))
+    return limits
+
+
+admission = AdmissionControl(
+    settings.admission_max_concurrent,
+    settings.admission_queue_size,
+    settings.admission_route_limits,
+    settings.rate_limit_per_second,
+    settings.rate_limit_burst,
+    settings.forwarded_allow_ips,
+)
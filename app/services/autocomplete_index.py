@@ -0,0 +1,121 @@
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+from ..models.autocomplete import Suggestion
+from .changes import ChangeListener, change_feed
+from .lookup_index import Slot, root_forms, translation_forms
+from .search_index import normalize
+
+# Headwords beat glosses, which beat inflected forms, when one entry matches a key in several slots
+_SLOT_PRIORITY = {"kelma": 0, "root": 0, "english": 1}
+
+
+def _priority(slot: str) -> int:
+    """Rank of a slot; lower is better."""
+    return _SLOT_PRIORITY.get(slot, 2)
+
+
+def translation_slots(translation) -> List[Slot]:
+    """(slot, value) pairs a translation can be suggested by."""
+    slots = translation_forms(translation)
+    if translation.english:
+        slots.append(("english", translation.english))
+    return slots
+
+
+def completion_keys(value: str) -> List[str]:
+    """Normalized value plus the tail starting at each later word, so "big house" is found by "hou"."""
+    words = normalize(value).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class AutocompleteIndex(ChangeListener):
+    """Sorted array of normalized keys, searched by prefix with binary search."""
+
+    def __init__(
+        self,
+        collection: str,
+        extract: Callable[[BaseModel], List[Slot]],
+        describe: Callable[[BaseModel], Tuple[str, Optional[str], Optional[str]]],
+    ):
+        self.collection = collection
+        self._extract = extract
+        self._describe = describe
+        self.ready = False
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.ready = False
+        self._keys: List[str] = []
+        self._postings: Dict[str, Dict[str, Slot]] = {}
+        self._entry_keys: Dict[str, List[str]] = {}
+        self._entries: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {}
+
+    def loaded(self) -> None:
+        """Sort the keys once after a bulk load and start answering queries."""
+        self._keys = sorted(self._postings)
+        self.ready = True
+
+    def upsert(self, doc_id: str, document: BaseModel) -> None:
+        """Index or re-index the values of one entry."""
+        self.remove(doc_id)
+        best: Dict[str, Slot] = {}
+        for slot, value in self._extract(document):
+            for key in completion_keys(value):
+                if key not in best or _priority(slot) < _priority(best[key][0]):
+                    best[key] = (slot, value)
+        for key, match in best.items():
+            postings = self._postings.get(key)
+            if postings is None:
+                postings = self._postings[key] = {}
+                if self.ready:
+                    # During a bulk load the keys are sorted once in loaded()
+                    insort(self._keys, key)
+            postings[doc_id] = match
+        self._entry_keys[doc_id] = list(best)
+        self._entries[doc_id] = self._describe(document)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove the values of one entry."""
+        for key in self._entry_keys.pop(doc_id, []):
+            postings = self._postings[key]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[key]
+                if self.ready:
+                    del self._keys[bisect_left(self._keys, key)]
+        self._entries.pop(doc_id, None)
+
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, Suggestion]]:
+        """(key, suggestion) pairs for keys starting with a normalized prefix, in key order, one per entry."""
+        results: List[Tuple[str, Suggestion]] = []
+        seen = set()
+        position = bisect_left(self._keys, prefix)
+        while position < len(self._keys) and len(results) < limit:
+            key = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            for doc_id, (slot, text) in self._postings[key].items():
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                headword, cat, english = self._entries[doc_id]
+                results.append((key, Suggestion.model_construct(
+                    text=text, slot=slot, collection=self.collection, id=doc_id,
+                    headword=headword, cat=cat, english=english,
+                )))
+                if len(results) >= limit:
+                    break
+            position += 1
+        return results
+
+
+translation_autocomplete = AutocompleteIndex(
+    "translations", translation_slots, lambda t: (t.kelma, t.cat, t.english)
+)
+root_autocomplete = AutocompleteIndex("roots", root_forms, lambda r: (r.root, None, None))
+
+change_feed.subscribe("translations", translation_autocomplete)
+change_feed.subscribe("roots", root_autocomplete)
@@ -0,0 +1,28 @@
+from heapq import merge
+from itertools import islice
+from typing import List
+
+from ..models.autocomplete import Suggestion
+from .autocomplete_index import root_autocomplete, translation_autocomplete
+from .search_index import normalize
+
+
+class AutocompleteService:
+    """Service for typeahead suggestions, answered from the in-process prefix indexes."""
+
+    @property
+    def ready(self) -> bool:
+        """Whether both indexes have been loaded."""
+        return translation_autocomplete.ready and root_autocomplete.ready
+
+    def complete(self, query: str, limit: int = 10) -> List[Suggestion]:
+        """Suggestions whose kelma, english, root or inflected form starts with the query."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        matches = merge(
+            translation_autocomplete.complete(prefix, limit),
+            root_autocomplete.complete(prefix, limit),
+            key=lambda match: match[0],
+        )
+        return [suggestion for _, suggestion in islice(matches, limit)]
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Literal, Optional
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..models.bulk import BatchResult, TranslationPatch
+from ..models.root import Root
+from ..models.translation import Translation
+from .changes import change_feed
+from .lookup_index import form_keys, root_forms
+from .transactions import run_atomically
+
+Dependents = Literal["keep", "detach", "delete"]
+
+# Translations re-read per query when publishing a batch to the change feed
+_PUBLISH_CHUNK = 1000
+
+
+class BatchService:
+    """Multi-document changes to roots and their translations, applied in one transaction."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.roots = db.roots
+        self.translations = db.translations
+
+    async def rename_root(self, root_id: str, new_value: str) -> Optional[BatchResult]:
+        """Rename a root and move every translation derived from it to the new value."""
+        async def rename(session):
+            document = await self.roots.find_one({"_id": ObjectId(root_id)}, session=session)
+            if document is None:
+                return None
+            renamed = Root.from_mongo({**document, "root": new_value})
+            await self.roots.update_one(
+                {"_id": document["_id"]},
+                {"$set": {"root": new_value, "forms": form_keys(root_forms(renamed))}},
+                session=session,
+            )
+            ids = await self._translation_ids({"root": document["root"]}, session)
+            updated = 0
+            if ids:
+                result = await self.translations.update_many(
+                    {"_id": {"$in": ids}}, {"$set": {"root": new_value}}, session=session
+                )
+                updated = result.modified_count
+            return renamed, ids, BatchResult(roots_updated=1, translations_updated=updated)
+
+        outcome = await run_atomically(self.db, rename)
+        if outcome is None:
+            return None
+        renamed, ids, result = outcome
+        change_feed.upserted(self.roots.name, renamed.id, renamed)
+        await self._publish_translations(ids)
+        return result
+
+    async def delete_root(self, root_id: str, dependents: Dependents = "keep") -> Optional[BatchResult]:
+        """Delete a root and keep, detach (unset `root`) or delete the translations derived from it."""
+        async def delete(session):
+            document = await self.roots.find_one({"_id": ObjectId(root_id)}, session=session)
+            if document is None:
+                return None
+            result = BatchResult(roots_deleted=1)
+            ids = [] if dependents == "keep" else await self._translation_ids({"root": document["root"]}, session)
+            if ids and dependents == "detach":
+                detached = await self.translations.update_many(
+                    {"_id": {"$in": ids}}, {"$unset": {"root": ""}}, session=session
+                )
+                result.translations_updated = detached.modified_count
+            elif ids and dependents == "delete":
+                deleted = await self.translations.delete_many({"_id": {"$in": ids}}, session=session)
+                result.translations_deleted = deleted.deleted_count
+            await self.roots.delete_one({"_id": document["_id"]}, session=session)
+            return ids, result
+
+        outcome = await run_atomically(self.db, delete)
+        if outcome is None:
+            return None
+        ids, result = outcome
+        change_feed.removed(self.roots.name, root_id)
+        if dependents == "detach":
+            await self._publish_translations(ids)
+        elif dependents == "delete":
+            for doc_id in ids:
+                change_feed.removed(self.translations.name, str(doc_id))
+        return result
+
+    async def patch_translations(self, patch: TranslationPatch) -> BatchResult:
+        """Set the same fields on every translation matching a filter."""
+        update = patch.update.model_dump(exclude_none=True)
+        query: Dict[str, Any] = patch.filter.to_query()
+        if "noun_type" in update:
+            # Only nouns carry a noun type
+            query = {"$and": [query, {"cat": "noun"}]}
+
+        async def apply(session):
+            ids = await self._translation_ids(query, session)
+            if not ids:
+                return ids, 0
+            result = await self.translations.update_many({"_id": {"$in": ids}}, {"$set": update}, session=session)
+            return ids, result.modified_count
+
+        ids, updated = await run_atomically(self.db, apply)
+        await self._publish_translations(ids)
+        return BatchResult(translations_updated=updated)
+
+    async def _translation_ids(self, query: Dict[str, Any], session) -> List[ObjectId]:
+        """IDs of the translations matching a query, read inside the transaction."""
+        cursor = self.translations.find(query, {"_id": 1}, session=session)
+        return [document["_id"] async for document in cursor]
+
+    async def _publish_translations(self, ids: List[ObjectId]) -> None:
+        """Re-read committed translations and publish them to the change feed."""
+        for start in range(0, len(ids), _PUBLISH_CHUNK):
+            cursor = self.translations.find({"_id": {"$in": ids[start:start + _PUBLISH_CHUNK]}})
+            async for document in cursor:
+                translation = Translation.from_mongo(document)
+                change_feed.upserted(self.translations.name, translation.id, translation)
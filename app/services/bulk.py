@@ -0,0 +1,80 @@
+from typing import Any, AsyncIterator, Callable, List, Tuple, Type
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+
+from ..models.bulk import BulkResult, BulkRowError
+from .changes import change_feed
+from .metrics import timed
+
+
+def _describe(error: ValidationError) -> str:
+    """Compact one-line description of a validation error."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in error.errors()
+    )
+
+
+def validate_row(model: Type[BaseModel], row: Any) -> BaseModel:
+    """Validate a raw JSON line or an already-decoded object."""
+    with timed("validation"):
+        if isinstance(row, (str, bytes)):
+            return model.model_validate_json(row)
+        return model.model_validate(row)
+
+
+async def insert_in_chunks(
+    collection: AsyncIOMotorCollection,
+    rows: AsyncIterator[Any],
+    to_document: Callable[[Any], dict],
+    to_entry: Callable[[dict], BaseModel],
+    chunk_size: int = 1000,
+) -> BulkResult:
+    """Validate rows and insert them with unordered `insert_many`, one chunk at a time."""
+    result = BulkResult()
+    chunk: List[Tuple[int, Any]] = []
+    row_number = 0
+    async for row in rows:
+        chunk.append((row_number, row))
+        row_number += 1
+        if len(chunk) >= chunk_size:
+            await _insert_chunk(collection, chunk, to_document, to_entry, result)
+            chunk = []
+    if chunk:
+        await _insert_chunk(collection, chunk, to_document, to_entry, result)
+    result.errors.sort(key=lambda error: error.row)
+    return result
+
+
+async def _insert_chunk(
+    collection: AsyncIOMotorCollection,
+    chunk: List[Tuple[int, Any]],
+    to_document: Callable[[Any], dict],
+    to_entry: Callable[[dict], BaseModel],
+    result: BulkResult,
+) -> None:
+    """Validate and insert one chunk, recording per-row errors."""
+    documents, row_numbers = [], []
+    for row_number, row in chunk:
+        try:
+            documents.append(to_document(row))
+            row_numbers.append(row_number)
+        except ValidationError as e:
+            result.errors.append(BulkRowError(row=row_number, error=_describe(e)))
+    if not documents:
+        return
+
+    failed = set()
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            failed.add(write_error["index"])
+            result.errors.append(BulkRowError(row=row_numbers[write_error["index"]], error=write_error["errmsg"]))
+
+    for index, document in enumerate(documents):
+        if index in failed:
+            continue
+        entry = to_entry(document)
+        change_feed.upserted(collection.name, entry.id, entry)
+        result.inserted += 1
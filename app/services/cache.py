@@ -0,0 +1,83 @@
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from ..config.settings import settings
+from .versions import CollectionVersions, collection_versions
+
+_MISSING = object()
+
+
+class ReadThroughCache:
+    """Bounded LRU cache with TTL, invalidated by collection generations."""
+
+    def __init__(self, versions: CollectionVersions, max_entries: int, ttl_seconds: float):
+        self._versions = versions
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get_or_load(self, collection: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for a key, loading it on a miss."""
+        entry_key = (collection, self._versions.generation(collection), key)
+        value = self._get(entry_key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = await loader()
+        # Only store values that are still current once the load has finished
+        if entry_key[1] == self._versions.generation(collection):
+            self._put(entry_key, value)
+        return value
+
+    def _get(self, entry_key: Hashable) -> Any:
+        """Look up a live entry and mark it as recently used."""
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[entry_key]
+            return _MISSING
+        self._entries.move_to_end(entry_key)
+        return value
+
+    def _put(self, entry_key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones beyond the bound."""
+        self._entries[entry_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+read_cache = ReadThroughCache(collection_versions, settings.cache_max_entries, settings.cache_ttl_seconds)
+
+
+def cached(method):
+    """Serve a service read method through the read-through cache."""
+    @functools.wraps(method)
+    async def wrapper(self, *args):
+        collection = self.collection.name
+        key = (self.collection.database.name, method.__name__, *args)
+        return await read_cache.get_or_load(collection, key, lambda: method(self, *args))
+    return wrapper
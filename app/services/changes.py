@@ -0,0 +1,53 @@
+from collections import defaultdict
+from typing import Dict, List
+from pydantic import BaseModel
+
+
+class ChangeListener:
+    """In-process state derived from a collection, kept current on writes."""
+
+    def clear(self) -> None:
+        """Drop everything before the collection is (re)loaded."""
+
+    def upsert(self, doc_id: str, document: BaseModel) -> None:
+        """Add or replace one entry."""
+
+    def remove(self, doc_id: str) -> None:
+        """Remove one entry."""
+
+    def loaded(self) -> None:
+        """Called once the collection has been fully loaded."""
+
+
+class ChangeFeed:
+    """Fans out service writes to the listeners of each collection."""
+
+    def __init__(self):
+        self._listeners: Dict[str, List[ChangeListener]] = defaultdict(list)
+
+    def subscribe(self, collection: str, listener: ChangeListener) -> None:
+        """Register a listener for a collection."""
+        self._listeners[collection].append(listener)
+
+    def reset(self, collection: str) -> None:
+        """Tell listeners a full reload of the collection is starting."""
+        for listener in self._listeners[collection]:
+            listener.clear()
+
+    def upserted(self, collection: str, doc_id: str, document: BaseModel) -> None:
+        """Tell listeners an entry was created or updated."""
+        for listener in self._listeners[collection]:
+            listener.upsert(doc_id, document)
+
+    def removed(self, collection: str, doc_id: str) -> None:
+        """Tell listeners an entry was deleted."""
+        for listener in self._listeners[collection]:
+            listener.remove(doc_id)
+
+    def loaded(self, collection: str) -> None:
+        """Tell listeners a full reload of the collection has finished."""
+        for listener in self._listeners[collection]:
+            listener.loaded()
+
+
+change_feed = ChangeFeed()
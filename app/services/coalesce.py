@@ -0,0 +1,70 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .metrics import service_reads
+from .versions import CollectionVersions, collection_versions
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of a call argument (filter dicts, field lists, sort tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class SingleFlight:
+    """Runs at most one load per key at a time; concurrent callers await the same result.
+
+    Keys include the collection generation, so a caller arriving after a write
+    never joins a query that started before it.
+    """
+
+    def __init__(self, versions: CollectionVersions):
+        self._versions = versions
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, collection: str, name: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of the in-flight load for a key, starting one if there is none."""
+        flight_key = (collection, self._versions.generation(collection), key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(loader())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._landed(flight_key, done))
+            joined = False
+        else:
+            self.coalesced += 1
+            joined = True
+        service_reads.inc((collection, name, "coalesced" if joined else "executed"))
+        # A caller that disconnects must not cancel the load for everyone else
+        return await asyncio.shield(task)
+
+    def _landed(self, flight_key: Hashable, task: asyncio.Future) -> None:
+        """Forget a finished load so the next caller starts a fresh one."""
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+        if not task.cancelled():
+            # Mark the error as retrieved when every waiter has gone away
+            task.exception()
+
+    def stats(self) -> dict:
+        """Executed and coalesced call counters."""
+        return {"in_flight": len(self._in_flight), "executed": self.executed, "coalesced": self.coalesced}
+
+
+single_flight = SingleFlight(collection_versions)
+
+
+def coalesced(method):
+    """Share one query between concurrent identical calls of a service read method."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (self.collection.database.name, method.__name__, _freeze(args), _freeze(kwargs))
+        return await single_flight.do(self.collection.name, method.__name__, key, lambda: method(self, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,42 @@
+import asyncio
+from collections import defaultdict
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..models.entry import Entry
+from ..models.root import Root
+from ..models.translation import Translation
+
+
+class EntryService:
+    """Service for reading roots together with their translations."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.roots = db.roots
+        self.translations = db.translations
+
+    async def get_entries(self, root_values: Optional[List[str]] = None) -> List[Entry]:
+        """Get the given roots (or all roots) with their translations, in two batched queries."""
+        if root_values:
+            root_query = {"root": {"$in": root_values}}
+            translation_query = {"root": {"$in": root_values}}
+        else:
+            root_query = {}
+            translation_query = {"root": {"$ne": None}}
+
+        roots, translations = await asyncio.gather(
+            self.roots.find(root_query).to_list(length=None),
+            self.translations.find(translation_query).to_list(length=None),
+        )
+
+        by_root = defaultdict(list)
+        for translation in translations:
+            by_root[translation["root"]].append(Translation.from_mongo(translation))
+
+        entries = {
+            root["root"]: Entry.model_construct(root=Root.from_mongo(root), translations=by_root[root["root"]])
+            for root in roots
+        }
+        if root_values:
+            return [entries[value] for value in dict.fromkeys(root_values) if value in entries]
+        return list(entries.values())
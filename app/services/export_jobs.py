@@ -0,0 +1,210 @@
+import asyncio
+import os
+import re
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+
+from ..models.export import ExportFormat, ExportJob
+from .exporters import EXPORT_FORMATS
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class ExportQueue:
+    """Runs exports in the background, a bounded number at a time, into files on local disk.
+
+    Each job is recorded as JSON in `<id>.job` next to its file, so every worker
+    sharing the directory can report on and serve any job. Jobs not updated for
+    `ttl_seconds` are swept, together with their files.
+    """
+
+    def __init__(self):
+        self.directory: Optional[str] = None
+        self.ttl_seconds = 3600.0
+        self._semaphore = asyncio.Semaphore(2)
+        self._jobs: Dict[str, ExportJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def configure(self, directory: Optional[str], max_concurrent: int, ttl_seconds: float) -> None:
+        """Set where files go, how many exports run at once and how long results are kept."""
+        # The default is a fixed path so that the workers of one host share it
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "kelma-exports")
+        os.makedirs(self.directory, exist_ok=True)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.ttl_seconds = ttl_seconds
+
+    def start(self) -> None:
+        """Start sweeping expired jobs in the background."""
+        self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    def submit(self, db: AsyncIOMotorDatabase, export_format: ExportFormat) -> ExportJob:
+        """Queue an export and return its job straight away."""
+        job = ExportJob(id=uuid.uuid4().hex, format=export_format, created_at=datetime.now(timezone.utc))
+        self._jobs[job.id] = job
+        self._save(job, create=True)
+        self._tasks[job.id] = asyncio.create_task(self._run(db, job))
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """A job by ID, whichever worker runs it."""
+        if job_id in self._jobs:
+            return self._jobs[job_id]
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        try:
+            with open(self._metadata_path(job_id), encoding="utf-8") as f:
+                return ExportJob.model_validate_json(f.read())
+        except (FileNotFoundError, ValidationError):
+            return None
+
+    def path(self, job_id: str) -> Optional[str]:
+        """File of a finished export."""
+        job = self.get(job_id)
+        if job is None or job.status != "done":
+            return None
+        path = self._file_path(job)
+        return path if os.path.exists(path) else None
+
+    def media_type(self, job_id: str) -> str:
+        """Content type of an export's file."""
+        return EXPORT_FORMATS[self.get(job_id).format][2]
+
+    def filename(self, job_id: str) -> str:
+        """Download name of an export's file."""
+        job = self.get(job_id)
+        return f"kelma-{job.format}{EXPORT_FORMATS[job.format][1]}"
+
+    async def remove(self, job_id: str) -> bool:
+        """Cancel a job if this worker is running it, and delete its record and file.
+
+        A job running in another worker stops being reported at once; that worker
+        deletes the file when it notices the record is gone.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._discard(job)
+        return True
+
+    async def shutdown(self) -> None:
+        """Stop sweeping and cancel this worker's unfinished jobs; finished files stay for other workers."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        for job_id in list(self._tasks):
+            await self.remove(job_id)
+
+    async def _run(self, db: AsyncIOMotorDatabase, job: ExportJob) -> None:
+        """Wait for a free slot, then stream the export into a temporary file."""
+        exporter = EXPORT_FORMATS[job.format][0]
+        path = self._file_path(job)
+        partial = f"{path}.part"
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = datetime.now(timezone.utc)
+                self._save(job)
+                with open(partial, "w", encoding="utf-8", newline="") as out:
+                    job.rows = await exporter(db, out)
+                os.replace(partial, path)
+            job.size = os.path.getsize(path)
+            job.status = "done"
+        except asyncio.CancelledError:
+            _unlink(partial)
+            raise
+        except Exception as e:
+            _unlink(partial)
+            job.status = "failed"
+            job.error = str(e)
+            print(f"Export {job.id} ({job.format}) failed: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._tasks.pop(job.id, None)
+            self._jobs.pop(job.id, None)
+        if not self._save(job):
+            # Removed through another worker while it ran
+            _unlink(path)
+
+    async def _sweep_periodically(self) -> None:
+        """Sweep expired jobs a few times per TTL."""
+        while True:
+            await asyncio.sleep(min(self.ttl_seconds / 4, 60.0))
+            self._expire()
+
+    def _expire(self) -> None:
+        """Delete the records and files of jobs not updated within the TTL.
+
+        Finished jobs expire after the TTL; unfinished ones not running here are
+        taken to be abandoned by a worker that died.
+        """
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.directory):
+            job_id, extension = os.path.splitext(name)
+            if extension not in (".job", ".part") or job_id.split(".")[0] in self._tasks:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                expired = os.path.getmtime(path) < cutoff
+            except FileNotFoundError:
+                continue
+            if not expired:
+                continue
+            job = self.get(job_id) if extension == ".job" else None
+            if job is not None:
+                self._discard(job)
+            else:
+                _unlink(path)
+
+    def _save(self, job: ExportJob, create: bool = False) -> bool:
+        """Write a job's record atomically; unless creating it, only while it has not been removed."""
+        path = self._metadata_path(job.id)
+        if not create and not os.path.exists(path):
+            return False
+        partial = f"{path}.{os.getpid()}.part"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(job.model_dump_json())
+        os.replace(partial, path)
+        return True
+
+    def _discard(self, job: ExportJob) -> None:
+        """Drop a job's record and file."""
+        self._jobs.pop(job.id, None)
+        self._tasks.pop(job.id, None)
+        _unlink(self._metadata_path(job.id))
+        _unlink(self._file_path(job))
+
+    def _metadata_path(self, job_id: str) -> str:
+        """Record of a job."""
+        return os.path.join(self.directory, f"{job_id}.job")
+
+    def _file_path(self, job: ExportJob) -> str:
+        """Result file of a job."""
+        return os.path.join(self.directory, f"{job.id}{EXPORT_FORMATS[job.format][1]}")
+
+
+def _unlink(path: str) -> None:
+    """Delete a file if it exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+export_queue = ExportQueue()
@@ -0,0 +1,158 @@
+import csv
+from typing import Awaitable, Callable, Dict, Optional, TextIO, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+
+from ..models.root import Root
+from ..models.translation import NounFields, Translation, VerbFields
+
+BATCH_SIZE = 1000
+
+NOUN_FIELDS = list(NounFields.model_fields)
+VERB_FIELDS = list(VerbFields.model_fields)
+CSV_COLUMNS = (
+    ["_id", "kelma", "english", "root", "cat", "swadesh", "noun_type"]
+    + [f"noun_fields.{name}" for name in NOUN_FIELDS]
+    + [f"verb_fields.{name}" for name in VERB_FIELDS]
+)
+
+
+def _translations(db: AsyncIOMotorDatabase, query: Optional[dict] = None, sort: Tuple[str, int] = ("_id", 1)):
+    """Translations streamed from a cursor in batches."""
+    return db.translations.find(query or {}).sort(*sort).batch_size(BATCH_SIZE)
+
+
+async def export_csv(db: AsyncIOMotorDatabase, out: TextIO) -> int:
+    """Every translation as one CSV row, with noun and verb forms flattened into columns."""
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    rows = 0
+    async for document in _translations(db):
+        translation = Translation.from_mongo(document)
+        noun = translation.noun_fields
+        verb = translation.verb_fields
+        writer.writerow(
+            [translation.id, translation.kelma, translation.english, translation.root or "", translation.cat,
+             translation.swadesh, translation.noun_type or ""]
+            + [getattr(noun, name, None) or "" for name in NOUN_FIELDS]
+            + [getattr(verb, name, None) or "" for name in VERB_FIELDS]
+        )
+        rows += 1
+    return rows
+
+
+async def export_json(db: AsyncIOMotorDatabase, out: TextIO) -> int:
+    """Both collections as one JSON document, in the same shape the API returns them."""
+    rows = 0
+    out.write("{")
+    for position, (name, model) in enumerate((("roots", Root), ("translations", Translation))):
+        out.write(f'{"," if position else ""}"{name}":[')
+        first = True
+        async for document in db[name].find({}).sort("_id", 1).batch_size(BATCH_SIZE):
+            out.write(("" if first else ",") + model.from_mongo(document).model_dump_json(by_alias=True))
+            first = False
+            rows += 1
+        out.write("]")
+    out.write("}\n")
+    return rows
+
+
+def _definition(translation: Translation) -> str:
+    """One Markdown list item for a translation."""
+    swadesh = " · Swadesh" if translation.swadesh else ""
+    return f"- **{translation.kelma}** *({translation.cat}{swadesh})* — {translation.english}\n"
+
+
+def _root_heading(root: Root) -> str:
+    """Markdown heading of a root with its base meaning."""
+    meaning = root.mode.base.prim if root.mode and root.mode.base else None
+    return f"\n## {root.root}\n\n" + (f"*{meaning}*\n\n" if meaning else "")
+
+
+async def export_markdown(db: AsyncIOMotorDatabase, out: TextIO) -> int:
+    """A printable dictionary: every root with the translations derived from it, then unrooted words.
+
+    Roots and translations are both read sorted by root value and merged, so
+    neither collection is held in memory.
+    """
+    rows = 0
+    out.write("# Kelma dictionary\n")
+    roots = db.roots.find({}).sort("root", 1).batch_size(BATCH_SIZE)
+    current: Optional[str] = None
+
+    async def next_root() -> Optional[Root]:
+        """Next root in root order, or None when exhausted."""
+        document = await anext(roots, None)
+        return Root.from_mongo(document) if document is not None else None
+
+    pending = await next_root()
+    async for document in _translations(db, {"root": {"$ne": None}}, ("root", 1)):
+        translation = Translation.from_mongo(document)
+        # Roots without translations, up to this translation's root
+        while pending is not None and pending.root < translation.root:
+            out.write(_root_heading(pending))
+            rows += 1
+            pending = await next_root()
+        if translation.root != current:
+            current = translation.root
+            if pending is not None and pending.root == current:
+                out.write(_root_heading(pending))
+                rows += 1
+                pending = await next_root()
+            else:
+                out.write(f"\n## {current}\n\n*(root not in the dictionary)*\n\n")
+        out.write(_definition(translation))
+        rows += 1
+    while pending is not None:
+        out.write(_root_heading(pending))
+        rows += 1
+        pending = await next_root()
+
+    heading_written = False
+    async for document in _translations(db, {"root": None}, ("kelma", 1)):
+        if not heading_written:
+            out.write("\n## Without root\n\n")
+            heading_written = True
+        out.write(_definition(Translation.from_mongo(document)))
+        rows += 1
+    return rows
+
+
+def _paradigm(translation: Translation, fields: BaseModel) -> str:
+    """Markdown table of one word's inflected forms, labelled with the field descriptions."""
+    lines = [
+        f"\n### {translation.kelma} — {translation.english}\n\n",
+        f"| Form | {translation.kelma} |\n",
+        "|---|---|\n",
+    ]
+    for name, info in type(fields).model_fields.items():
+        value = getattr(fields, name, None)
+        if value:
+            lines.append(f"| {info.description or name} | {value} |\n")
+    return "".join(lines)
+
+
+async def export_paradigms(db: AsyncIOMotorDatabase, out: TextIO) -> int:
+    """Inflection tables for every noun and verb, alphabetically."""
+    rows = 0
+    out.write("# Kelma paradigms\n")
+    for cat, title, group in (("noun", "Nouns", "noun_fields"), ("verb", "Verbs", "verb_fields")):
+        out.write(f"\n## {title}\n")
+        async for document in _translations(db, {"cat": cat}, ("kelma", 1)):
+            translation = Translation.from_mongo(document)
+            fields = getattr(translation, group)
+            if fields is not None:
+                out.write(_paradigm(translation, fields))
+                rows += 1
+    return rows
+
+
+Exporter = Callable[[AsyncIOMotorDatabase, TextIO], Awaitable[int]]
+
+# format -> (exporter, file extension, media type)
+EXPORT_FORMATS: Dict[str, Tuple[Exporter, str, str]] = {
+    "csv": (export_csv, ".csv", "text/csv"),
+    "json": (export_json, ".json", "application/json"),
+    "markdown": (export_markdown, ".md", "text/markdown"),
+    "paradigms": (export_paradigms, ".md", "text/markdown"),
+}
@@ -0,0 +1,137 @@
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from pydantic import BaseModel
+
+from ..config.settings import settings
+from .changes import ChangeListener, change_feed
+from .lookup_index import Slot
+from .search_index import normalize, tokenize
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, or `limit + 1` once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+def deletes(term: str, distance: int) -> Set[str]:
+    """The term and every string made by deleting up to `distance` characters from it."""
+    variants = {term}
+    frontier = {term}
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+def translation_terms(translation) -> List[Slot]:
+    """(slot, term) pairs a translation can be found by: its kelma and each word of its english."""
+    terms = [("kelma", translation.kelma)] if translation.kelma else []
+    terms.extend(("english", word) for word in tokenize(normalize(translation.english or "")))
+    return terms
+
+
+def root_terms(root) -> List[Slot]:
+    """(slot, term) pairs a root can be found by."""
+    return [("root", root.root)] if root.root else []
+
+
+class FuzzyIndex(ChangeListener):
+    """SymSpell deletion dictionary: finds terms within a small edit distance of a query.
+
+    Every indexed term is stored under each variant of its first `prefix_length`
+    characters with up to `max_distance` deletions. A query generates the same
+    variants, so candidates are a handful of dictionary lookups followed by an
+    exact distance check, independent of the number of terms.
+    """
+
+    def __init__(self, extract: Callable[[BaseModel], List[Slot]], max_distance: int, prefix_length: int):
+        self._extract = extract
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.ready = False
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.ready = False
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+        self._terms: Dict[str, Dict[str, str]] = {}
+        self._entry_terms: Dict[str, List[str]] = {}
+        self._documents: Dict[str, BaseModel] = {}
+
+    def loaded(self) -> None:
+        """Start answering queries from the index."""
+        self.ready = True
+
+    def upsert(self, doc_id: str, document: BaseModel) -> None:
+        """Index or re-index the terms of one entry."""
+        self.remove(doc_id)
+        slots: Dict[str, str] = {}
+        for slot, value in self._extract(document):
+            slots.setdefault(normalize(value), slot)
+        for term, slot in slots.items():
+            if term not in self._terms:
+                self._terms[term] = {}
+                for variant in self._variants(term):
+                    self._deletes[variant].add(term)
+            self._terms[term][doc_id] = slot
+        self._entry_terms[doc_id] = list(slots)
+        self._documents[doc_id] = document
+
+    def remove(self, doc_id: str) -> None:
+        """Remove the terms of one entry."""
+        for term in self._entry_terms.pop(doc_id, []):
+            entries = self._terms[term]
+            entries.pop(doc_id, None)
+            if not entries:
+                del self._terms[term]
+                for variant in self._variants(term):
+                    holders = self._deletes[variant]
+                    holders.discard(term)
+                    if not holders:
+                        del self._deletes[variant]
+        self._documents.pop(doc_id, None)
+
+    def _variants(self, term: str) -> Iterable[str]:
+        """Deletion variants of a term's prefix."""
+        return deletes(term[:self.prefix_length], self.max_distance)
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, str, BaseModel, str]]:
+        """(distance, term, entry, slot) for every entry with a term within `max_distance` of the query."""
+        query = normalize(query)
+        # Within len(query) edits everything short would match
+        max_distance = min(max_distance, self.max_distance, max(len(query) - 1, 0))
+        prefix = query[:self.prefix_length]
+        candidates: Set[str] = set()
+        for variant in deletes(prefix, max_distance):
+            candidates |= self._deletes.get(variant, set())
+
+        matches = []
+        for term in candidates:
+            distance = edit_distance(query, term, max_distance)
+            if distance <= max_distance:
+                matches.extend(
+                    (distance, term, self._documents[doc_id], slot) for doc_id, slot in self._terms[term].items()
+                )
+        return matches
+
+
+translation_fuzzy_index = FuzzyIndex(translation_terms, settings.fuzzy_max_distance, settings.fuzzy_prefix_length)
+root_fuzzy_index = FuzzyIndex(root_terms, settings.fuzzy_max_distance, settings.fuzzy_prefix_length)
+
+change_feed.subscribe("translations", translation_fuzzy_index)
+change_feed.subscribe("roots", root_fuzzy_index)
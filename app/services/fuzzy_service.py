@@ -0,0 +1,75 @@
+from typing import Dict, List, Tuple
+from pydantic import BaseModel
+
+from ..models.fuzzy import FuzzyMatch
+from .fuzzy_index import root_fuzzy_index, translation_fuzzy_index
+from .search_index import normalize, tokenize
+
+# Headwords rank above English glosses at equal distance
+_SLOT_PRIORITY = {"kelma": 0, "root": 0, "english": 1}
+
+
+class FuzzyService:
+    """Service for typo-tolerant search, answered from the in-process deletion dictionaries."""
+
+    @property
+    def ready(self) -> bool:
+        """Whether both indexes have been loaded."""
+        return translation_fuzzy_index.ready and root_fuzzy_index.ready
+
+    def search(self, query: str, max_distance: int = 2, limit: int = 50) -> List[FuzzyMatch]:
+        """Translations by kelma or english word, and roots, within `max_distance` edits, closest first.
+
+        A query of several words also matches entries that have a term close to each
+        word, at the sum of the words' distances.
+        """
+        matches = self._matches(query, max_distance)
+        words = tokenize(normalize(query))
+        if len(words) > 1:
+            matches.extend(self._phrase_matches(words, max_distance))
+        matches.sort(key=lambda match: (match[0], _SLOT_PRIORITY[match[4]], match[1], match[3].id))
+
+        results, seen = [], set()
+        for distance, term, collection, entry, slot in matches:
+            if entry.id in seen:
+                continue
+            seen.add(entry.id)
+            results.append(FuzzyMatch.model_construct(
+                distance=distance, term=term, slot=slot, collection=collection,
+                translation=entry if collection == "translations" else None,
+                root=entry if collection == "roots" else None,
+            ))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _matches(self, term: str, max_distance: int) -> List[Tuple[int, str, str, BaseModel, str]]:
+        """(distance, term, collection, entry, slot) for entries with a term close to the given one."""
+        return [
+            (distance, found, "translations", entry, slot)
+            for distance, found, entry, slot in translation_fuzzy_index.search(term, max_distance)
+        ] + [
+            (distance, found, "roots", entry, slot)
+            for distance, found, entry, slot in root_fuzzy_index.search(term, max_distance)
+        ]
+
+    def _phrase_matches(self, words: List[str], max_distance: int) -> List[Tuple[int, str, str, BaseModel, str]]:
+        """Entries with a close term for every word, within `max_distance` edits in total."""
+        per_word: List[Dict[Tuple[str, str], tuple]] = []
+        for word in words:
+            closest: Dict[Tuple[str, str], tuple] = {}
+            for distance, term, collection, entry, slot in self._matches(word, max_distance):
+                key = (collection, entry.id)
+                if key not in closest or (distance, _SLOT_PRIORITY[slot]) < closest[key][:2]:
+                    closest[key] = (distance, _SLOT_PRIORITY[slot], term, slot, entry)
+            per_word.append(closest)
+
+        matches = []
+        for key in set(per_word[0]).intersection(*per_word[1:]):
+            parts = [closest[key] for closest in per_word]
+            distance = sum(part[0] for part in parts)
+            if distance <= max_distance:
+                # Reported under the weakest slot any of the words matched in
+                slot = max(parts, key=lambda part: part[1])[3]
+                matches.append((distance, " ".join(part[2] for part in parts), key[0], parts[0][4], slot))
+        return matches
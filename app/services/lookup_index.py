@@ -0,0 +1,130 @@
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+from .changes import ChangeListener, change_feed
+from .search_index import normalize
+
+Slot = Tuple[str, str]
+
+MODE_NAMES = ("base", "long", "strong")
+
+
+def translation_forms(translation) -> List[Slot]:
+    """(slot, form) pairs of a translation: the word itself and every inflected form."""
+    slots = [("kelma", translation.kelma)]
+    for group in ("noun_fields", "verb_fields"):
+        fields = getattr(translation, group)
+        if fields is not None:
+            slots.extend((f"{group}.{name}", value) for name, value in _values(fields))
+    return [(slot, form) for slot, form in slots if form]
+
+
+def root_forms(root) -> List[Slot]:
+    """(slot, form) pairs of a root: the root itself and every sub-form of each mode."""
+    slots = [("root", root.root)]
+    for mode_name in MODE_NAMES:
+        mode = getattr(root.mode, mode_name)
+        if mode is not None:
+            slots.extend((f"mode.{mode_name}.{name}", value) for name, value in _values(mode))
+    return [(slot, form) for slot, form in slots if form]
+
+
+def _values(fields: BaseModel) -> List[Tuple[str, str]]:
+    """Field name/value pairs of a nested model."""
+    return [(name, getattr(fields, name, None)) for name in type(fields).model_fields]
+
+
+def form_keys(slots: List[Slot]) -> List[str]:
+    """Normalized, de-duplicated forms, as materialized in the `forms` field."""
+    return sorted({normalize(form) for _, form in slots})
+
+
+async def update_with_forms(
+    collection,
+    object_id,
+    update_data: dict,
+    source_fields: Tuple[str, ...],
+    forms_of: Callable[[dict], List[str]],
+    attempts: int = 5,
+) -> Optional[dict]:
+    """Apply a `$set` and store the matching `forms` in the same write; returns the updated document.
+
+    `forms_of` computes the forms from a document with the `source_fields`. When the
+    update sets all or none of them this is a single round trip. Otherwise the other
+    source fields are read first and the write only applies if they are unchanged,
+    retrying otherwise, so `forms` is never stored stale.
+    """
+    touched = [field for field in source_fields if field in update_data]
+    query = {"_id": object_id}
+    if not touched:
+        return await collection.find_one_and_update(query, {"$set": update_data}, return_document=ReturnDocument.AFTER)
+    if len(touched) == len(source_fields):
+        update = {**update_data, "forms": forms_of({"_id": object_id, **update_data})}
+        return await collection.find_one_and_update(query, {"$set": update}, return_document=ReturnDocument.AFTER)
+
+    for _ in range(attempts):
+        current = await collection.find_one(query, {field: 1 for field in source_fields})
+        if current is None:
+            return None
+        unchanged = {field: current.get(field) for field in source_fields if field not in update_data}
+        update = {**update_data, "forms": forms_of({**current, **update_data})}
+        updated = await collection.find_one_and_update(
+            {**query, **unchanged}, {"$set": update}, return_document=ReturnDocument.AFTER
+        )
+        if updated is not None:
+            return updated
+    raise RuntimeError(f"{collection.name} {object_id} kept changing during the update")
+
+
+class FormIndex(ChangeListener):
+    """Hash index from every normalized form to the entries and slots holding it."""
+
+    def __init__(self, extract: Callable[[BaseModel], List[Slot]]):
+        self._extract = extract
+        self.ready = False
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.ready = False
+        self._documents: Dict[str, BaseModel] = {}
+        self._forms: Dict[str, Dict[str, List[str]]] = defaultdict(dict)
+        self._keys: Dict[str, List[str]] = {}
+
+    def loaded(self) -> None:
+        """Start answering lookups from the index."""
+        self.ready = True
+
+    def upsert(self, doc_id: str, document: BaseModel) -> None:
+        """Index or re-index the forms of one entry."""
+        self.remove(doc_id)
+        slots_by_form: Dict[str, List[str]] = defaultdict(list)
+        for slot, form in self._extract(document):
+            slots_by_form[normalize(form)].append(slot)
+        for key, slots in slots_by_form.items():
+            self._forms[key][doc_id] = slots
+        self._documents[doc_id] = document
+        self._keys[doc_id] = list(slots_by_form)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove the forms of one entry."""
+        for key in self._keys.pop(doc_id, []):
+            entries = self._forms[key]
+            entries.pop(doc_id, None)
+            if not entries:
+                del self._forms[key]
+        self._documents.pop(doc_id, None)
+
+    def lookup(self, form: str) -> List[Tuple[BaseModel, str]]:
+        """Entries holding the form, with the slot that matched."""
+        entries = self._forms.get(normalize(form), {})
+        return [(self._documents[doc_id], slot) for doc_id, slots in entries.items() for slot in slots]
+
+
+translation_form_index = FormIndex(translation_forms)
+root_form_index = FormIndex(root_forms)
+
+change_feed.subscribe("translations", translation_form_index)
+change_feed.subscribe("roots", root_form_index)
@@ -0,0 +1,42 @@
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..models.lookup import LookupMatch
+from ..models.root import Root
+from ..models.translation import Translation
+from .lookup_index import root_form_index, root_forms, translation_form_index, translation_forms
+from .search_index import normalize
+
+
+class LookupService:
+    """Service for finding entries by any of their inflected forms."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.translations = db.translations
+        self.roots = db.roots
+
+    async def lookup(self, form: str) -> List[LookupMatch]:
+        """Find translations and roots that have the form in any slot."""
+        if translation_form_index.ready and root_form_index.ready:
+            translations = translation_form_index.lookup(form)
+            roots = root_form_index.lookup(form)
+        else:
+            translations = await self._find(self.translations, Translation, translation_forms, form)
+            roots = await self._find(self.roots, Root, root_forms, form)
+        return [
+            LookupMatch(collection="translations", slot=slot, translation=translation)
+            for translation, slot in translations
+        ] + [
+            LookupMatch(collection="roots", slot=slot, root=root)
+            for root, slot in roots
+        ]
+
+    @staticmethod
+    async def _find(collection, model, extract, form: str) -> list:
+        """Query the materialized `forms` field and work out which slots matched."""
+        key = normalize(form)
+        matches = []
+        async for document in collection.find({"forms": key}):
+            entry = model.from_mongo(document)
+            matches.extend((entry, slot) for slot, value in extract(entry) if normalize(value) == key)
+        return matches
@@ -0,0 +1,299 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    """Render a Prometheus label set."""
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative histogram per label set."""
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Labels, List[int]] = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._sums: Dict[Labels, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        """Record one observation."""
+        with self._lock:
+            self._counts[labels][bisect_left(self.buckets, value)] += 1
+            self._sums[labels] += value
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {self._sums[labels]}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Increase the value."""
+        with self._lock:
+            self._values[labels] += amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        """Decrease the value."""
+        self.inc(labels, -amount)
+
+    def set(self, labels: Labels, value: float) -> None:
+        """Replace the value."""
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Counter(Gauge):
+    """Monotonic value per label set."""
+
+    kind = "counter"
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        """Add a metric to the registry."""
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before rendering."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Text exposition of all metrics."""
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "kelma_http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status"), LATENCY_BUCKETS
+))
+http_response_size = registry.register(Histogram(
+    "kelma_http_response_size_bytes", "HTTP response body size.", ("method", "route"), SIZE_BUCKETS
+))
+http_in_flight = registry.register(Gauge(
+    "kelma_http_requests_in_flight", "HTTP requests currently being served.", ("method",)
+))
+mongo_command_duration = registry.register(Histogram(
+    "kelma_mongo_command_duration_seconds", "MongoDB command latency.", ("collection", "command", "outcome"),
+    LATENCY_BUCKETS
+))
+mongo_documents_returned = registry.register(Counter(
+    "kelma_mongo_documents_returned_total", "Documents returned by MongoDB commands.", ("collection", "command")
+))
+admission_active = registry.register(Gauge(
+    "kelma_admission_active", "Admitted expensive requests currently running.", ("route",)
+))
+admission_queued = registry.register(Gauge(
+    "kelma_admission_queued", "Expensive requests waiting for a free slot.", ("route",)
+))
+admission_rejected = registry.register(Counter(
+    "kelma_admission_rejected_total", "Expensive requests turned away before running.", ("route", "reason")
+))
+service_reads = registry.register(Counter(
+    "kelma_service_reads_total", "Service read calls, by whether they ran a query or joined one already in flight.",
+    ("collection", "method", "outcome")
+))
+sync_changes_applied = registry.register(Counter(
+    "kelma_sync_changes_applied_total", "Changes from other writers applied to in-process state.",
+    ("collection", "operation")
+))
+sync_lag = registry.register(Histogram(
+    "kelma_sync_lag_seconds", "Delay between a write being committed and this process applying it.", (),
+    LATENCY_BUCKETS
+))
+
+
+class RequestTimings:
+    """Time spent in each phase of one request, in seconds."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = defaultdict(float)
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Accumulate time for a phase."""
+        self.phases[phase] += seconds
+
+
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(phase: str):
+    """Attribute the time spent in the block to a phase of the current request."""
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+class MongoCommandMonitor(monitoring.CommandListener):
+    """Records per-collection/per-command MongoDB latency and returned documents."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[int, object], Tuple[str, str]] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        self._pending[(event.request_id, event.connection_id)] = (
+            collection if isinstance(collection, str) else "", event.command_name
+        )
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+        cursor = event.reply.get("cursor") if isinstance(event.reply, dict) else None
+        if cursor:
+            documents = len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+            collection = cursor.get("ns", "").partition(".")[2]
+            mongo_documents_returned.inc((collection, event.command_name), documents)
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+    def _finish(self, event, outcome: str) -> None:
+        """Record latency and attribute it to the current request's DB phase."""
+        collection, command = self._pending.pop((event.request_id, event.connection_id), ("", event.command_name))
+        seconds = event.duration_micros / 1e6
+        mongo_command_duration.observe((collection, command, outcome), seconds)
+        # Motor runs commands in executor threads with a copy of the caller's context
+        timings = request_timings.get()
+        if timings is not None:
+            timings.add("db", seconds)
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks connection pool activity for the readiness probe.
+
+    pymongo calls listeners from its monitor and application threads, so counters are updated under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter, e.g. in a worker forked from a process that had its own pool."""
+        with self._lock:
+            self.opened = 0
+            self.closed = 0
+            self.checked_out = 0
+            self.check_out_failures = 0
+            self.clears = 0
+
+    def stats(self) -> dict:
+        """Current pool counters."""
+        with self._lock:
+            return {
+                "open": self.opened - self.closed,
+                "in_use": self.checked_out,
+                "created_total": self.opened,
+                "closed_total": self.closed,
+                "check_out_failures": self.check_out_failures,
+                "clears": self.clears,
+            }
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        """Adjust one counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count("clears")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count("opened")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count("closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count("check_out_failures")
+
+    def connection_checked_out(self, event):
+        self._count("checked_out")
+
+    def connection_checked_in(self, event):
+        self._count("checked_out", -1)
+
+
+pool_monitor = PoolMonitor()
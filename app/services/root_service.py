@@ -1,7 +1,19 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from ..models.bulk import BulkResult
 from ..models.root import Root, RootCreate, RootUpdate
+from .bulk import insert_in_chunks, validate_row
+from .cache import cached
+from .changes import change_feed
+from .coalesce import coalesced
+from .lookup_index import form_keys, root_forms, update_with_forms
+from .search_index import root_index
+
+# Fields the materialized `forms` are derived from
+FORM_FIELDS = ("root", "mode")
 
 
 class RootService:
@@ -10,29 +22,76 @@ class RootService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db.roots
     
-    async def get_all(self) -> List[Root]:
-        """Get all roots."""
-        cursor = self.collection.find({})
+    @coalesced
+    async def get_all(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[Root]:
+        """Get all roots, or one keyset page of them when `after`/`limit` are given."""
+        cursor = self._find_page(after, limit)
         roots = await cursor.to_list(length=None)
-        return [Root(**{**root, "_id": str(root["_id"])}) for root in roots]
-    
+        return [Root.from_mongo(root) for root in roots]
+
+    @coalesced
+    async def get_all_fields(
+        self, fields: List[str], after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[dict]:
+        """Get roots projected to the given fields, as plain documents."""
+        cursor = self._find_page(after, limit, {field: 1 for field in fields})
+        roots = await cursor.to_list(length=None)
+        return [{**root, "_id": str(root["_id"])} for root in roots]
+
+    async def iter_all(
+        self, after: Optional[str] = None, limit: Optional[int] = None, batch_size: int = 500
+    ) -> AsyncIterator[Root]:
+        """Iterate over roots in batches without loading the whole collection."""
+        cursor = self._find_page(after, limit).batch_size(batch_size)
+        async for root in cursor:
+            yield Root.from_mongo(root)
+
+    def _find_page(self, after: Optional[str], limit: Optional[int], projection: Optional[dict] = None):
+        """Build a cursor over roots ordered by `_id`, starting after the given ID."""
+        if after is None and limit is None:
+            return self.collection.find({}, projection)
+        query = {"_id": {"$gt": ObjectId(after)}} if after else {}
+        cursor = self.collection.find(query, projection).sort("_id", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    @cached
+    @coalesced
     async def get_by_id(self, root_id: str) -> Optional[Root]:
         """Get a root by ID."""
         try:
             root = await self.collection.find_one({"_id": ObjectId(root_id)})
             if root:
-                return Root(**{**root, "_id": str(root["_id"])})
+                return Root.from_mongo(root)
             return None
         except Exception:
             return None
     
     async def create(self, root_data: RootCreate) -> Root:
         """Create a new root."""
-        root_dict = root_data.model_dump()
+        root_dict = self._to_document(root_data)
         result = await self.collection.insert_one(root_dict)
-        created_root = await self.collection.find_one({"_id": result.inserted_id})
-        return Root(**{**created_root, "_id": str(created_root["_id"])})
+        root = Root.from_mongo({**root_dict, "_id": result.inserted_id})
+        change_feed.upserted(self.collection.name, root.id, root)
+        return root
     
+    async def create_many(self, rows: AsyncIterator[Any]) -> BulkResult:
+        """Import roots in bulk, validating each row with RootCreate."""
+        return await insert_in_chunks(
+            self.collection,
+            rows,
+            lambda row: self._to_document(validate_row(RootCreate, row)),
+            Root.from_mongo,
+        )
+
+    @staticmethod
+    def _to_document(root_data: RootCreate) -> dict:
+        """Stored form of a new root, with its inflected forms materialized for lookups."""
+        document = root_data.model_dump()
+        document["forms"] = form_keys(root_forms(root_data))
+        return document
+
     async def update(self, root_id: str, root_data: RootUpdate) -> Optional[Root]:
         """Update a root by ID."""
         try:
@@ -40,14 +99,21 @@ class RootService:
             if not update_data:
                 return await self.get_by_id(root_id)
             
-            result = await self.collection.update_one(
-                {"_id": ObjectId(root_id)},
-                {"$set": update_data}
+            updated = await update_with_forms(
+                self.collection,
+                ObjectId(root_id),
+                update_data,
+                FORM_FIELDS,
+                lambda document: form_keys(root_forms(Root.from_mongo(document))),
             )
-            
-            if result.matched_count:
-                return await self.get_by_id(root_id)
+
+            if updated:
+                root = Root.from_mongo(updated)
+                change_feed.upserted(self.collection.name, root.id, root)
+                return root
             return None
+        except DuplicateKeyError:
+            raise
         except Exception:
             return None
     
@@ -55,24 +121,35 @@ class RootService:
         """Delete a root by ID."""
         try:
             result = await self.collection.delete_one({"_id": ObjectId(root_id)})
+            if result.deleted_count:
+                change_feed.removed(self.collection.name, root_id)
             return result.deleted_count > 0
         except Exception:
             return False
     
-    async def search(self, query: str) -> List[Root]:
+    async def search(self, query: str, limit: int = 50) -> List[Root]:
         """Search roots by root text or primary meaning."""
+        if root_index.ready:
+            return root_index.search(query, limit)
+        return await self._regex_search(query, limit)
+
+    @coalesced
+    async def _regex_search(self, query: str, limit: int) -> List[Root]:
+        """Search MongoDB with case-insensitive regexes, until the in-process index is loaded."""
         cursor = self.collection.find({
             "$or": [
                 {"root": {"$regex": query, "$options": "i"}},
                 {"prim": {"$regex": query, "$options": "i"}}
             ]
         })
-        roots = await cursor.to_list(length=None)
-        return [Root(**{**root, "_id": str(root["_id"])}) for root in roots]
+        roots = await cursor.to_list(length=limit)
+        return [Root.from_mongo(root) for root in roots]
 
+    @cached
+    @coalesced
     async def get_by_root_value(self, root_value: str) -> Optional[Root]:
         """Get a root by its root field value (exact match)."""
         root = await self.collection.find_one({"root": root_value})
         if root:
-            return Root(**{**root, "_id": str(root["_id"])})
+            return Root.from_mongo(root)
         return None
@@ -0,0 +1,136 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, List, Set
+from pydantic import BaseModel
+
+from .changes import ChangeListener, change_feed
+
+_TOKEN_RE = re.compile(r"\w+")
+_GRAM_SIZE = 3
+
+EXACT, PREFIX, SUBSTRING = 3, 2, 1
+
+
+def normalize(text: str) -> str:
+    """Case-fold text and strip diacritics."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split normalized text into word tokens."""
+    return _TOKEN_RE.findall(text)
+
+
+def _grams(token: str) -> Set[str]:
+    """Character n-grams of a token."""
+    return {token[i:i + _GRAM_SIZE] for i in range(len(token) - _GRAM_SIZE + 1)}
+
+
+def rank_match(query: str, texts: List[str]) -> int:
+    """Score how well a normalized query matches an entry's normalized fields."""
+    rank = 0
+    for text in texts:
+        if text == query:
+            return EXACT
+        if text.startswith(query) or any(token.startswith(query) for token in tokenize(text)):
+            rank = max(rank, PREFIX)
+        elif query in text:
+            rank = max(rank, SUBSTRING)
+    return rank
+
+
+class SearchIndex(ChangeListener):
+    """In-memory inverted index with token and n-gram postings."""
+
+    def __init__(self, fields: Callable[[BaseModel], List[str]]):
+        self._fields = fields
+        self.ready = False
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.ready = False
+        self._documents: Dict[str, BaseModel] = {}
+        self._texts: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._grams: Dict[str, Set[str]] = defaultdict(set)
+
+    def loaded(self) -> None:
+        """Start answering searches from the index."""
+        self.ready = True
+
+    def upsert(self, doc_id: str, document: BaseModel) -> None:
+        """Index or re-index one entry."""
+        self.remove(doc_id)
+        texts = [normalize(value) for value in self._fields(document) if value]
+        self._documents[doc_id] = document
+        self._texts[doc_id] = texts
+        for token in {token for text in texts for token in tokenize(text)}:
+            if not self._postings[token]:
+                for gram in _grams(token):
+                    self._grams[gram].add(token)
+            self._postings[token].add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove one entry from the index."""
+        texts = self._texts.pop(doc_id, None)
+        if texts is None:
+            return
+        del self._documents[doc_id]
+        for token in {token for text in texts for token in tokenize(text)}:
+            postings = self._postings[token]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                for gram in _grams(token):
+                    self._grams[gram].discard(token)
+                    if not self._grams[gram]:
+                        del self._grams[gram]
+
+    def search(self, query: str, limit: int) -> List[BaseModel]:
+        """Return entries matching the query, exact matches first, then prefix, then substring."""
+        query = normalize(query)
+        if not query:
+            return []
+        probes = tokenize(query)
+        if probes:
+            candidates = set()
+            for token in self._tokens_containing(max(probes, key=len)):
+                candidates |= self._postings[token]
+        else:
+            candidates = set(self._documents)
+
+        scored = []
+        for doc_id in candidates:
+            rank = rank_match(query, self._texts[doc_id])
+            if rank:
+                scored.append((-rank, min(self._texts[doc_id], key=len, default=""), doc_id))
+        scored.sort()
+        return [self._documents[doc_id] for _, _, doc_id in scored[:limit]]
+
+    def _tokens_containing(self, probe: str) -> List[str]:
+        """Indexed tokens that contain the probe, narrowed by n-grams when it is long enough."""
+        if len(probe) < _GRAM_SIZE:
+            return [token for token in self._postings if probe in token]
+        grams = sorted((self._grams.get(gram, set()) for gram in _grams(probe)), key=len)
+        return [token for token in set.intersection(*grams) if probe in token]
+
+
+def translation_search_fields(translation) -> List[str]:
+    """Searchable fields of a translation."""
+    return [translation.kelma, translation.english, translation.root]
+
+
+def root_search_fields(root) -> List[str]:
+    """Searchable fields of a root: the root text and the primary meaning of each mode."""
+    modes = [root.mode.base, root.mode.long, root.mode.strong]
+    return [root.root] + [mode.prim for mode in modes if mode is not None]
+
+
+translation_index = SearchIndex(translation_search_fields)
+root_index = SearchIndex(root_search_fields)
+
+change_feed.subscribe("translations", translation_index)
+change_feed.subscribe("roots", root_index)
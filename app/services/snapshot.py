@@ -0,0 +1,403 @@
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+
+from ..models.root import Root
+from ..models.translation import Translation
+from .search_index import normalize, root_search_fields, tokenize, translation_search_fields
+
+# Layout: header, section table, then 8-byte aligned sections. All integers are little-endian.
+MAGIC = b"KELMASN2"
+_HEADER = struct.Struct("<8sI")
+_SECTION = struct.Struct("<32sQQ")
+_ALIGN = 8
+# Column entry of a record whose key field is unset
+_MISSING = 0xFFFFFFFF
+
+COLLECTIONS: Dict[str, Type[BaseModel]] = {"roots": Root, "translations": Translation}
+
+# Fields that list requests filter or sort on, stored as columns so reads never decode records for them
+KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "roots": ("root",),
+    "translations": ("kelma", "english", "cat", "swadesh", "noun_type", "root"),
+}
+
+# Key fields list requests can sort on; their orders are sorted when the snapshot is built
+ORDER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "roots": (),
+    "translations": ("kelma", "english"),
+}
+
+
+class ReadOnlySnapshotError(Exception):
+    """Raised when a write is attempted while serving from a snapshot."""
+
+
+# --- Building -----------------------------------------------------------------
+
+def _string_table(postings: Dict[str, List[int]]) -> bytes:
+    """Encode a sorted string table: count, key offsets, posting offsets, key blob, postings.
+
+    Keys are sorted by their UTF-8 bytes so readers can binary-search raw bytes.
+    """
+    keys = sorted((key.encode(), key) for key in postings)
+    key_offsets, posting_offsets = array("I", [0]), array("I", [0])
+    blob, records = bytearray(), array("I")
+    for encoded, key in keys:
+        blob += encoded
+        key_offsets.append(len(blob))
+        records.extend(sorted(set(postings[key])))
+        posting_offsets.append(len(records))
+    padding = b"\0" * (-len(blob) % 4)
+    return (
+        struct.pack("<I", len(keys)) + key_offsets.tobytes() + posting_offsets.tobytes()
+        + bytes(blob) + padding + records.tobytes()
+    )
+
+
+def _key(value: Any) -> str:
+    """String-table key of a key field value."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _key_sections(name: str, field: str, values: List[Any]) -> Iterable[Tuple[str, bytes]]:
+    """Sections of one key field: its distinct values, each record's index into them and, if sortable, its order."""
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for number, value in enumerate(values):
+        if value is not None:
+            postings[_key(value)].append(number)
+    # Same order as the string table's keys
+    indexes = {key: index for index, key in enumerate(sorted(postings, key=str.encode))}
+    column = array("I", (_MISSING if value is None else indexes[_key(value)] for value in values))
+    yield f"{name}.keys.{field}", _string_table(postings)
+    yield f"{name}.column.{field}", column.tobytes()
+    if field in ORDER_FIELDS[name]:
+        order = sorted(range(len(values)), key=lambda number: (values[number] or "", number))
+        yield f"{name}.order.{field}", array("I", order).tobytes()
+
+
+def _collection_sections(name: str, entries: List[BaseModel]) -> Iterable[Tuple[str, bytes]]:
+    """Sections of one collection; `entries` must be sorted by `_id`."""
+    ids, offsets, records = bytearray(), array("Q", [0]), bytearray()
+    by_root: Dict[str, List[int]] = defaultdict(list)
+    tokens: Dict[str, List[int]] = defaultdict(list)
+    columns: Dict[str, List[Any]] = {field: [] for field in KEY_FIELDS[name]}
+    fields = root_search_fields if name == "roots" else translation_search_fields
+    for number, entry in enumerate(entries):
+        ids += ObjectId(entry.id).binary
+        record = entry.model_dump_json(by_alias=True)
+        records += record.encode()
+        offsets.append(len(records))
+        document = json.loads(record)
+        for field, values in columns.items():
+            values.append(document.get(field))
+        if entry.root:
+            by_root[entry.root].append(number)
+        for value in fields(entry):
+            for token in tokenize(normalize(value or "")):
+                tokens[token].append(number)
+    yield f"{name}.ids", bytes(ids)
+    yield f"{name}.offsets", offsets.tobytes()
+    yield f"{name}.records", bytes(records)
+    yield f"{name}.by_root", _string_table(by_root)
+    yield f"{name}.tokens", _string_table(tokens)
+    for field, values in columns.items():
+        yield from _key_sections(name, field, values)
+
+
+def write_snapshot(path: str, collections: Dict[str, List[BaseModel]]) -> None:
+    """Write a snapshot atomically: readers see either the old file or the complete new one."""
+    sections = [("meta", json.dumps({
+        "built_at": time.time(),
+        "counts": {name: len(entries) for name, entries in collections.items()},
+    }).encode())]
+    for name, entries in collections.items():
+        sections.extend(_collection_sections(name, entries))
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table, layout = [], []
+    for name, data in sections:
+        offset += -offset % _ALIGN
+        table.append(_SECTION.pack(name.encode(), offset, len(data)))
+        layout.append((offset, data))
+        offset += len(data)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(sections)))
+            f.write(b"".join(table))
+            for section_offset, data in layout:
+                f.write(b"\0" * (section_offset - f.tell()))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def build_snapshot(db: AsyncIOMotorDatabase, path: str) -> Dict[str, int]:
+    """Export roots and translations from MongoDB into a snapshot file."""
+    collections = {}
+    for name, model in COLLECTIONS.items():
+        cursor = db[name].find({}).sort("_id", 1).batch_size(1000)
+        collections[name] = [model.from_mongo(document) async for document in cursor]
+    write_snapshot(path, collections)
+    return {name: len(entries) for name, entries in collections.items()}
+
+
+# --- Reading ------------------------------------------------------------------
+
+class _StringTable:
+    """Read side of a sorted string table."""
+
+    def __init__(self, view: memoryview):
+        (self._count,) = struct.unpack_from("<I", view, 0)
+        position = 4
+        self._key_offsets = view[position:position + 4 * (self._count + 1)].cast("I")
+        position += 4 * (self._count + 1)
+        self._posting_offsets = view[position:position + 4 * (self._count + 1)].cast("I")
+        position += 4 * (self._count + 1)
+        blob_size = self._key_offsets[self._count]
+        self._blob = view[position:position + blob_size]
+        position += blob_size + (-blob_size % 4)
+        self._postings = view[position:].cast("I")
+
+    def key(self, index: int) -> str:
+        """A key."""
+        return self._key(index).decode()
+
+    def _key(self, index: int) -> bytes:
+        """Raw UTF-8 bytes of a key."""
+        return bytes(self._blob[self._key_offsets[index]:self._key_offsets[index + 1]])
+
+    def _lower_bound(self, key: bytes) -> int:
+        """First index whose key is >= the given key."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def postings(self, index: int) -> memoryview:
+        """Record numbers stored for a key."""
+        return self._postings[self._posting_offsets[index]:self._posting_offsets[index + 1]]
+
+    def find(self, key: str) -> Optional[int]:
+        """Index of an exact key."""
+        encoded = key.encode()
+        index = self._lower_bound(encoded)
+        if index < self._count and self._key(index) == encoded:
+            return index
+        return None
+
+    def containing(self, fragment: str) -> List[int]:
+        """Indexes of keys that contain the fragment, found by scanning the mapped key blob in place."""
+        pattern = re.compile(re.escape(fragment.encode()))
+        length = len(fragment.encode())
+        matches = []
+        match = pattern.search(self._blob)
+        while match:
+            position = match.start()
+            index = self._lower_bound_offset(position)
+            if position + length <= self._key_offsets[index + 1]:
+                if not matches or matches[-1] != index:
+                    matches.append(index)
+                match = pattern.search(self._blob, self._key_offsets[index + 1])
+            else:
+                match = pattern.search(self._blob, position + 1)
+        return matches
+
+    def _lower_bound_offset(self, position: int) -> int:
+        """Index of the key whose bytes include the given blob position."""
+        low, high = 0, self._count - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._key_offsets[middle] <= position:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+
+class _KeyColumn:
+    """Read side of a key field: its distinct values and each record's index into them."""
+
+    def __init__(self, table: memoryview, column: memoryview):
+        self.table = _StringTable(table)
+        self._column = column.cast("I")
+
+    def value(self, number: int) -> Any:
+        """The field's value in a record."""
+        index = self._column[number]
+        return None if index == _MISSING else json.loads(self.table.key(index))
+
+    def numbers(self, value: Any) -> Sequence[int]:
+        """Record numbers whose field equals a value."""
+        index = self.table.find(_key(value))
+        return self.table.postings(index) if index is not None else ()
+
+    def counts(self, numbers: Iterable[int]) -> Dict[Any, int]:
+        """How many of the given records hold each value."""
+        counts = Counter(self._column[number] for number in numbers)
+        return {
+            None if index == _MISSING else json.loads(self.table.key(index)): count
+            for index, count in counts.items()
+        }
+
+
+class SnapshotCollection:
+    """Read-only view of one collection in a snapshot."""
+
+    def __init__(self, sections: Dict[str, memoryview], name: str):
+        self.name = name
+        self.model = COLLECTIONS[name]
+        self._ids = sections[f"{name}.ids"]
+        self._offsets = sections[f"{name}.offsets"].cast("Q")
+        self._records = sections[f"{name}.records"]
+        self.by_root = _StringTable(sections[f"{name}.by_root"])
+        self.tokens = _StringTable(sections[f"{name}.tokens"])
+        self.keys = {
+            field: _KeyColumn(sections[f"{name}.keys.{field}"], sections[f"{name}.column.{field}"])
+            for field in KEY_FIELDS[name]
+        }
+        self._orders = {field: sections[f"{name}.order.{field}"].cast("I") for field in ORDER_FIELDS[name]}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def value(self, number: int, field: str) -> Any:
+        """A field of a record, from its column when it is a key field."""
+        column = self.keys.get(field)
+        return column.value(number) if column is not None else self.document(number).get(field)
+
+    def matching(self, field: str, value: Any) -> Sequence[int]:
+        """Record numbers whose field equals a value."""
+        column = self.keys.get(field)
+        if column is not None:
+            return column.numbers(value)
+        return [number for number in range(len(self)) if self.document(number).get(field) == value]
+
+    def order(self, field: str) -> Sequence[int]:
+        """Record numbers in ascending (field, `_id`) order, as sorted when the snapshot was built."""
+        return self._orders[field]
+
+    def document(self, number: int) -> dict:
+        """Decoded JSON document of a record."""
+        return json.loads(bytes(self._records[self._offsets[number]:self._offsets[number + 1]]))
+
+    def entry(self, number: int) -> BaseModel:
+        """Model of a record, built without validation."""
+        return self.model.from_mongo(self.document(number))
+
+    def _id(self, number: int) -> bytes:
+        """Binary ObjectId of a record."""
+        return bytes(self._ids[number * 12:(number + 1) * 12])
+
+    def position_after(self, doc_id: Optional[str]) -> int:
+        """Number of the first record whose ID is greater than the given one."""
+        if doc_id is None:
+            return 0
+        key = ObjectId(doc_id).binary
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._id(middle) <= key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_id(self, doc_id: str) -> Optional[int]:
+        """Record number of an ID."""
+        if not ObjectId.is_valid(doc_id):
+            return None
+        number = self.position_after(doc_id) - 1
+        if number >= 0 and self._id(number) == ObjectId(doc_id).binary:
+            return number
+        return None
+
+
+class Snapshot:
+    """A memory-mapped snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Kelma snapshot")
+        sections = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            sections[name.rstrip(b"\0").decode()] = view[offset:offset + length]
+        self.meta = json.loads(bytes(sections["meta"]))
+        self.collections = {name: SnapshotCollection(sections, name) for name in COLLECTIONS}
+
+
+class SnapshotStore:
+    """Holds the current snapshot and reopens it when the file is replaced."""
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.check_seconds = 1.0
+        self._snapshot: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._on_reload = []
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the API serves reads from a snapshot instead of MongoDB."""
+        return self.path is not None
+
+    def open(self, path: str, check_seconds: float) -> Snapshot:
+        """Start serving from a snapshot file."""
+        self.path = path
+        self.check_seconds = check_seconds
+        self._snapshot = Snapshot(path)
+        self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def on_reload(self, callback) -> None:
+        """Register a callback run after a newer snapshot has been mapped."""
+        self._on_reload.append(callback)
+
+    def current(self) -> Snapshot:
+        """The current snapshot, remapped if the file was rebuilt since the last check."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_seconds:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return self._snapshot
+            if (stat.st_ino, stat.st_mtime_ns) != self._snapshot.identity:
+                # The old mapping is released once in-flight readers drop it
+                self._snapshot = Snapshot(self.path)
+                print(f"Reloaded snapshot {self.path}")
+                for callback in self._on_reload:
+                    callback(self._snapshot)
+        return self._snapshot
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,185 @@
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple, Union
+from pymongo import ASCENDING
+
+from ..models.bulk import BulkResult
+from ..models.root import Root
+from ..models.translation import Translation, TranslationFacets
+from .search_index import normalize, rank_match, root_search_fields, tokenize, translation_search_fields
+from .snapshot import ReadOnlySnapshotError, SnapshotCollection, SnapshotStore
+
+
+class _SnapshotService:
+    """Read operations shared by the snapshot-backed services."""
+
+    collection_name: str
+
+    def __init__(self, store: SnapshotStore):
+        self.collection: SnapshotCollection = store.current().collections[self.collection_name]
+
+    def _page(
+        self,
+        after: Optional[Union[str, Tuple[Any, str]]],
+        limit: Optional[int],
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> Iterable[int]:
+        """Record numbers of one page, by default a keyset page in `_id` order.
+
+        Other orders break ties on `_id`, and `after` is then a (sort value, ID) pair.
+        """
+        collection = self.collection
+        if not filters and sort is None:
+            start = collection.position_after(after)
+            stop = len(collection) if limit is None else min(len(collection), start + limit)
+            return range(start, stop)
+        # Sort orders and key columns are stored in the snapshot; nothing is decoded to filter or sort
+        field, direction = sort or ("_id", ASCENDING)
+        if field == "_id":
+            numbers = range(len(collection))
+            if after is not None:
+                found = collection.find_id(after)
+                bound = collection.position_after(after)
+                numbers = numbers[bound:] if direction == ASCENDING else numbers[:found if found is not None else bound]
+        else:
+            numbers = collection.order(field)
+            if after is not None:
+                value, doc_id = after
+                # Records are numbered in `_id` order, so a number stands in for the ID tie-breaker
+                found = collection.find_id(doc_id)
+                bound = collection.position_after(doc_id)
+                key = lambda number: (collection.value(number, field) or "", number)
+                if direction == ASCENDING:
+                    numbers = numbers[bisect_left(numbers, (value or "", bound), key=key):]
+                else:
+                    numbers = numbers[:bisect_left(numbers, (value or "", found if found is not None else bound), key=key)]
+        if direction != ASCENDING:
+            numbers = numbers[::-1]
+        if filters:
+            matching = set.intersection(*(set(collection.matching(f, v)) for f, v in filters.items()))
+            numbers = [n for n in numbers if n in matching]
+        return numbers[:limit] if limit else numbers
+
+    async def get_all(
+        self,
+        after: Optional[Union[str, Tuple[Any, str]]] = None,
+        limit: Optional[int] = None,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> list:
+        """Get all entries, or one filtered, sorted or keyset page of them."""
+        return [self.collection.entry(number) for number in self._page(after, limit, filters, sort)]
+
+    async def get_all_fields(
+        self,
+        fields: List[str],
+        after: Optional[Union[str, Tuple[Any, str]]] = None,
+        limit: Optional[int] = None,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> List[dict]:
+        """Get entries projected to the given fields, as plain documents."""
+        documents = (self.collection.document(number) for number in self._page(after, limit, filters, sort))
+        return [{**{field: doc[field] for field in fields if field in doc}, "_id": doc["_id"]} for doc in documents]
+
+    async def iter_all(
+        self,
+        after: Optional[Union[str, Tuple[Any, str]]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> AsyncIterator[Any]:
+        """Iterate over entries straight from the mapped file."""
+        for number in self._page(after, limit, filters, sort):
+            yield self.collection.entry(number)
+
+    async def get_by_id(self, doc_id: str):
+        """Get an entry by ID."""
+        number = self.collection.find_id(doc_id)
+        return self.collection.entry(number) if number is not None else None
+
+    def _by_root(self, root: str) -> list:
+        """Entries listed under a root value."""
+        index = self.collection.by_root.find(root)
+        if index is None:
+            return []
+        return [self.collection.entry(number) for number in self.collection.by_root.postings(index)]
+
+    async def search(self, query: str, limit: int = 50) -> list:
+        """Search entries through the snapshot's token table, best matches first."""
+        query = normalize(query)
+        if not query:
+            return []
+        probes = tokenize(query)
+        if probes:
+            tokens = self.collection.tokens
+            candidates = set()
+            for index in tokens.containing(max(probes, key=len)):
+                candidates.update(tokens.postings(index))
+        else:
+            candidates = range(len(self.collection))
+
+        scored = []
+        for number in candidates:
+            entry = self.collection.entry(number)
+            texts = [normalize(value) for value in self._search_fields(entry) if value]
+            rank = rank_match(query, texts)
+            if rank:
+                scored.append((-rank, min(texts, key=len, default=""), number, entry))
+        scored.sort(key=lambda item: item[:3])
+        return [entry for *_, entry in scored[:limit]]
+
+    async def create(self, *args, **kwargs):
+        """Writes are not possible on a read-only snapshot."""
+        raise ReadOnlySnapshotError()
+
+    async def create_many(self, *args, **kwargs) -> BulkResult:
+        """Writes are not possible on a read-only snapshot."""
+        raise ReadOnlySnapshotError()
+
+    async def update(self, *args, **kwargs):
+        """Writes are not possible on a read-only snapshot."""
+        raise ReadOnlySnapshotError()
+
+    async def delete(self, *args, **kwargs) -> bool:
+        """Writes are not possible on a read-only snapshot."""
+        raise ReadOnlySnapshotError()
+
+
+class SnapshotRootService(_SnapshotService):
+    """RootService counterpart that reads from a memory-mapped snapshot."""
+
+    collection_name = "roots"
+    _search_fields = staticmethod(root_search_fields)
+
+    async def get_by_root_value(self, root_value: str) -> Optional[Root]:
+        """Get a root by its root field value (exact match)."""
+        roots = self._by_root(root_value)
+        return roots[0] if roots else None
+
+
+class SnapshotTranslationService(_SnapshotService):
+    """TranslationService counterpart that reads from a memory-mapped snapshot."""
+
+    collection_name = "translations"
+    _search_fields = staticmethod(translation_search_fields)
+
+    async def get_by_root(self, root: str) -> List[Translation]:
+        """Get all translations for a specific root."""
+        return self._by_root(root)
+
+    async def get_facets(self, filters: Tuple[Tuple[str, Any], ...] = ()) -> TranslationFacets:
+        """Count matching translations per category, Swadesh membership and noun type."""
+        numbers = self._page(None, None, dict(filters), None)
+        counts = {field: self.collection.keys[field].counts(numbers) for field in ("cat", "swadesh", "noun_type")}
+        swadesh = Counter()
+        for value, count in counts["swadesh"].items():
+            swadesh[str(bool(value)).lower()] += count
+        return TranslationFacets(
+            total=len(numbers),
+            cat={value: count for value, count in counts["cat"].items() if value is not None},
+            swadesh=dict(swadesh),
+            noun_type={value: count for value, count in counts["noun_type"].items() if value is not None},
+        )
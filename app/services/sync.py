@@ -0,0 +1,235 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from bson import decode, encode
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from ..models.root import Root
+from ..models.translation import Translation
+from .changes import change_feed
+from .metrics import sync_changes_applied, sync_lag
+from .transactions import is_replicated
+from .warmup import load_collection
+
+MODELS = {"roots": Root, "translations": Translation}
+
+# Server error code when the resume point has already left the oplog
+_CHANGE_STREAM_HISTORY_LOST = 286
+
+_RAW = CodecOptions(document_class=RawBSONDocument)
+
+
+class ChangeSync:
+    """Applies writes made by other workers and instances to this process's in-process state.
+
+    Tails a change stream on replica sets and sharded clusters; on a standalone server
+    (local development) it polls the server's write counters and diffs the collections
+    when they move.
+    """
+
+    def __init__(self):
+        self.mode: Optional[str] = None
+        self.resume_token: Optional[dict] = None
+        self.applied = 0
+        self.last_applied_at: Optional[float] = None
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._poll_seconds = 1.0
+        self._fingerprints: Dict[str, Dict[str, int]] = {}
+        # Server-wide write counter at the last poll; collections are only diffed once it moves
+        self._writes: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def prepare(self, db: AsyncIOMotorDatabase, poll_seconds: float) -> None:
+        """Record the starting point; call before the initial load so no write falls in between."""
+        self._db = db
+        self._poll_seconds = poll_seconds
+        if await is_replicated(db):
+            self.mode = "change_stream"
+            await self._start_from_now()
+        else:
+            self.mode = "polling"
+            self._writes = await self._write_count()
+            for collection in MODELS:
+                await self._poll(collection, publish=False)
+        print(f"Syncing in-process state via {self.mode.replace('_', ' ')}")
+
+    def attach(self, db: AsyncIOMotorDatabase) -> None:
+        """Continue from a position prepared in another process, over this process's connection."""
+        self._db = db
+
+    def start(self) -> None:
+        """Start following changes in the background."""
+        follow = self._follow_stream if self.mode == "change_stream" else self._follow_polling
+        self._task = asyncio.create_task(follow())
+
+    async def stop(self) -> None:
+        """Stop following changes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        """Sync mode and progress, for the readiness probe."""
+        return {
+            "mode": self.mode,
+            "applied": self.applied,
+            "last_applied_seconds_ago": (
+                round(time.time() - self.last_applied_at, 3) if self.last_applied_at is not None else None
+            ),
+        }
+
+    # --- Change streams ---------------------------------------------------------
+
+    def _watch(self):
+        """Database-wide change stream over the synced collections."""
+        return self._db.watch(
+            [{"$match": {"$or": [
+                {"ns.coll": {"$in": list(MODELS)}},
+                {"operationType": {"$in": ["dropDatabase", "invalidate"]}},
+            ]}}],
+            full_document="updateLookup",
+            start_after=self.resume_token,
+        )
+
+    async def _start_from_now(self) -> None:
+        """Take a resume token for the current point in the oplog."""
+        self.resume_token = None
+        async with self._watch() as stream:
+            # Opens the cursor; anything returned here predates the load that follows
+            await stream.try_next()
+            self.resume_token = stream.resume_token
+
+    async def _follow_stream(self) -> None:
+        """Apply change events, resuming from the last token after interruptions."""
+        while True:
+            try:
+                async with self._watch() as stream:
+                    async for change in stream:
+                        try:
+                            await self._apply(change)
+                        except PyMongoError:
+                            raise
+                        except Exception as e:
+                            # Skip an event that cannot be applied rather than stop syncing
+                            print(f"Skipping change {change.get('_id')} ({e!r})")
+                        self.resume_token = stream.resume_token
+            except OperationFailure as e:
+                if e.code != _CHANGE_STREAM_HISTORY_LOST:
+                    print(f"Change stream failed ({e}); retrying")
+                    await asyncio.sleep(1)
+                    continue
+                # Too far behind to resume: start over from a full reload
+                print("Change stream history lost; reloading in-process state")
+                await self._start_from_now()
+                for collection in MODELS:
+                    await load_collection(self._db, collection)
+            except PyMongoError as e:
+                print(f"Change stream interrupted ({e}); resuming")
+                await asyncio.sleep(1)
+            except Exception as e:
+                print(f"Change stream failed ({e!r}); resuming")
+                await asyncio.sleep(1)
+
+    async def _apply(self, change: dict) -> None:
+        """Publish one change event to the in-process listeners."""
+        operation = change["operationType"]
+        collection = change.get("ns", {}).get("coll")
+        if operation in ("insert", "update", "replace"):
+            doc_id = str(change["documentKey"]["_id"])
+            document = change.get("fullDocument")
+            if document is None:
+                # Deleted again before the post-image was looked up
+                change_feed.removed(collection, doc_id)
+            else:
+                change_feed.upserted(collection, doc_id, MODELS[collection].from_mongo(document))
+        elif operation == "delete":
+            change_feed.removed(collection, str(change["documentKey"]["_id"]))
+        elif operation in ("drop", "rename"):
+            await load_collection(self._db, collection)
+        elif operation in ("dropDatabase", "invalidate"):
+            for name in MODELS:
+                await load_collection(self._db, name)
+        else:
+            return
+
+        if "clusterTime" in change:
+            sync_lag.observe((), max(0.0, time.time() - change["clusterTime"].time))
+        self._applied(collection or "*", operation)
+
+    # --- Polling fallback -------------------------------------------------------
+
+    async def _follow_polling(self) -> None:
+        """Diff the collections against the previous poll at a fixed interval, once the server has taken writes."""
+        while True:
+            # Without write counters (serverStatus not permitted) every poll is a full read
+            await asyncio.sleep(self._poll_seconds if self._writes is not None else max(self._poll_seconds, 30.0))
+            writes = await self._write_count()
+            if writes is not None and writes == self._writes:
+                continue
+            for collection in MODELS:
+                try:
+                    await self._poll(collection, publish=True)
+                except PyMongoError as e:
+                    print(f"Polling {collection} failed ({e}); retrying")
+                    writes = None
+                except Exception as e:
+                    print(f"Polling {collection} failed ({e!r}); retrying")
+                    writes = None
+            self._writes = writes
+
+    async def _write_count(self) -> Optional[int]:
+        """Inserts, updates and deletes the server has executed, or None when it does not say."""
+        try:
+            status = await self._db.command("serverStatus", repl=0, metrics=0, locks=0)
+        except Exception:
+            # Not permitted, or not implemented by a stand-in server: fall back to periodic full reads
+            return None
+        counters = status.get("opcounters", {})
+        return counters.get("insert", 0) + counters.get("update", 0) + counters.get("delete", 0)
+
+    async def _poll(self, collection: str, publish: bool) -> None:
+        """Publish entries that were added, changed or removed since the last poll."""
+        previous = self._fingerprints.get(collection, {})
+        current = {}
+        model = MODELS[collection]
+        try:
+            # Raw documents are hashed as received; only the changed ones are decoded
+            source = self._db[collection].with_options(codec_options=_RAW)
+        except NotImplementedError:
+            # Stand-ins such as mongomock only return dicts
+            source = self._db[collection]
+        async for document in source.find({}).batch_size(1000):
+            doc_id = str(document["_id"])
+            data = document.raw if isinstance(document, RawBSONDocument) else encode(document)
+            current[doc_id] = fingerprint = hash(data)
+            if not publish or previous.get(doc_id) == fingerprint:
+                continue
+            try:
+                entry = model.from_mongo(decode(data))
+            except Exception as e:
+                # Skip an entry that cannot be read rather than stop syncing
+                print(f"Skipping {collection} {doc_id} ({e!r})")
+                continue
+            change_feed.upserted(collection, doc_id, entry)
+            self._applied(collection, "upsert")
+        if publish:
+            for doc_id in previous.keys() - current.keys():
+                change_feed.removed(collection, doc_id)
+                self._applied(collection, "delete")
+        self._fingerprints[collection] = current
+
+    def _applied(self, collection: str, operation: str) -> None:
+        """Count one applied change."""
+        sync_changes_applied.inc((collection, operation))
+        self.applied += 1
+        self.last_applied_at = time.time()
+
+
+change_sync = ChangeSync()
@@ -0,0 +1,34 @@
+import weakref
+from typing import Any, Awaitable, Callable, Optional
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+
+
+# Topology per client: it cannot change without reconnecting, so it is asked once
+_replicated: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+async def is_replicated(db: AsyncIOMotorDatabase) -> bool:
+    """Whether the server is a replica set member or a mongos; standalone servers have no transactions or change streams."""
+    replicated = _replicated.get(db.client)
+    if replicated is None:
+        try:
+            hello = await db.command("hello")
+        except Exception:
+            return False
+        replicated = _replicated[db.client] = "setName" in hello or hello.get("msg") == "isdbgrid"
+    return replicated
+
+
+async def run_atomically(
+    db: AsyncIOMotorDatabase,
+    callback: Callable[[Optional[AsyncIOMotorClientSession]], Awaitable[Any]],
+) -> Any:
+    """Run `callback(session)` inside a transaction, retried on transient errors.
+
+    On a standalone server (local development) there are no transactions, so the
+    callback runs once with no session and its writes are applied one by one.
+    """
+    if not await is_replicated(db):
+        return await callback(None)
+    async with await db.client.start_session() as session:
+        return await session.with_transaction(callback)
@@ -1,7 +1,18 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from ..models.translation import Translation, TranslationCreate, TranslationUpdate
+from pymongo import ASCENDING
+from ..models.bulk import BulkResult
+from ..models.translation import Translation, TranslationCreate, TranslationFacets, TranslationUpdate
+from .bulk import insert_in_chunks, validate_row
+from .cache import cached
+from .changes import change_feed
+from .coalesce import coalesced
+from .lookup_index import form_keys, translation_forms, update_with_forms
+from .search_index import translation_index
+
+# Fields the materialized `forms` are derived from
+FORM_FIELDS = ("kelma", "noun_fields", "verb_fields")
 
 
 class TranslationService:
@@ -10,28 +21,134 @@ class TranslationService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db.translations
 
-    async def get_all(self) -> List[Translation]:
-        """Get all translations."""
-        cursor = self.collection.find({})
+    @coalesced
+    async def get_all(
+        self,
+        after: Optional[Union[str, Tuple[Any, str]]] = None,
+        limit: Optional[int] = None,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> List[Translation]:
+        """Get all translations, or one filtered, sorted or keyset page of them."""
+        cursor = self._find_page(after, limit, filters=filters, sort=sort)
+        translations = await cursor.to_list(length=None)
+        return [Translation.from_mongo(trans) for trans in translations]
+
+    @coalesced
+    async def get_all_fields(
+        self,
+        fields: List[str],
+        after: Optional[Union[str, Tuple[Any, str]]] = None,
+        limit: Optional[int] = None,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> List[dict]:
+        """Get translations projected to the given fields, as plain documents."""
+        cursor = self._find_page(after, limit, {field: 1 for field in fields}, filters, sort)
         translations = await cursor.to_list(length=None)
-        return [Translation(**{**trans, "_id": str(trans["_id"])}) for trans in translations]
+        return [{**trans, "_id": str(trans["_id"])} for trans in translations]
+
+    async def iter_all(
+        self,
+        after: Optional[Union[str, Tuple[Any, str]]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ) -> AsyncIterator[Translation]:
+        """Iterate over translations in batches without loading the whole collection."""
+        cursor = self._find_page(after, limit, filters=filters, sort=sort).batch_size(batch_size)
+        async for trans in cursor:
+            yield Translation.from_mongo(trans)
+
+    def _find_page(
+        self,
+        after: Optional[Union[str, Tuple[Any, str]]],
+        limit: Optional[int],
+        projection: Optional[dict] = None,
+        filters: Optional[dict] = None,
+        sort: Optional[Tuple[str, int]] = None,
+    ):
+        """Build a cursor over matching translations, by default ordered by `_id` and starting after an ID.
+
+        Other orders break ties on `_id`, and `after` is then a (sort value, ID) pair.
+        """
+        query = dict(filters or {})
+        if after is None and limit is None and sort is None:
+            return self.collection.find(query, projection)
+        field, direction = sort or ("_id", ASCENDING)
+        beyond = "$gt" if direction == ASCENDING else "$lt"
+        if after and field == "_id":
+            query["_id"] = {beyond: ObjectId(after)}
+        elif after:
+            value, doc_id = after
+            query["$or"] = [{field: {beyond: value}}, {field: value, "_id": {beyond: ObjectId(doc_id)}}]
+        keys = [(field, direction)] if field == "_id" else [(field, direction), ("_id", direction)]
+        cursor = self.collection.find(query, projection).sort(keys)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    @cached
+    @coalesced
+    async def get_facets(self, filters: Tuple[Tuple[str, Any], ...] = ()) -> TranslationFacets:
+        """Count matching translations per category, Swadesh membership and noun type in one aggregation."""
+        def count_by(expression) -> list:
+            """Facet pipeline counting documents per value of an expression."""
+            return [{"$group": {"_id": expression, "count": {"$sum": 1}}}]
 
+        cursor = self.collection.aggregate([
+            {"$match": dict(filters)},
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "cat": count_by("$cat"),
+                "swadesh": count_by({"$ifNull": ["$swadesh", False]}),
+                "noun_type": [{"$match": {"noun_type": {"$ne": None}}}, *count_by("$noun_type")],
+            }},
+        ])
+        (facets,) = await cursor.to_list(length=None)
+        return TranslationFacets(
+            total=facets["total"][0]["count"] if facets["total"] else 0,
+            cat={group["_id"]: group["count"] for group in facets["cat"] if group["_id"] is not None},
+            swadesh={str(group["_id"]).lower(): group["count"] for group in facets["swadesh"]},
+            noun_type={group["_id"]: group["count"] for group in facets["noun_type"]},
+        )
+
+    @cached
+    @coalesced
     async def get_by_id(self, translation_id: str) -> Optional[Translation]:
         """Get a translation by ID."""
         try:
             translation = await self.collection.find_one({"_id": ObjectId(translation_id)})
             if translation:
-                return Translation(**{**translation, "_id": str(translation["_id"])})
+                return Translation.from_mongo(translation)
             return None
         except Exception:
             return None
 
     async def create(self, translation_data: TranslationCreate) -> Translation:
         """Create a new translation."""
-        translation_dict = translation_data.model_dump(exclude_none=True)
+        translation_dict = self._to_document(translation_data)
         result = await self.collection.insert_one(translation_dict)
-        created_translation = await self.collection.find_one({"_id": result.inserted_id})
-        return Translation(**{**created_translation, "_id": str(created_translation["_id"])})
+        translation = Translation.from_mongo({**translation_dict, "_id": result.inserted_id})
+        change_feed.upserted(self.collection.name, translation.id, translation)
+        return translation
+
+    async def create_many(self, rows: AsyncIterator[Any]) -> BulkResult:
+        """Import translations in bulk, validating each row with TranslationCreate."""
+        return await insert_in_chunks(
+            self.collection,
+            rows,
+            lambda row: self._to_document(validate_row(TranslationCreate, row)),
+            Translation.from_mongo,
+        )
+
+    @staticmethod
+    def _to_document(translation_data: TranslationCreate) -> dict:
+        """Stored form of a new translation, with its inflected forms materialized for lookups."""
+        document = translation_data.model_dump(exclude_none=True)
+        document["forms"] = form_keys(translation_forms(translation_data))
+        return document
 
     async def update(self, translation_id: str, translation_data: TranslationUpdate) -> Optional[Translation]:
         """Update a translation by ID."""
@@ -40,13 +157,18 @@ class TranslationService:
             if not update_data:
                 return await self.get_by_id(translation_id)
 
-            result = await self.collection.update_one(
-                {"_id": ObjectId(translation_id)},
-                {"$set": update_data}
+            updated = await update_with_forms(
+                self.collection,
+                ObjectId(translation_id),
+                update_data,
+                FORM_FIELDS,
+                lambda document: form_keys(translation_forms(Translation.from_mongo(document))),
             )
 
-            if result.matched_count:
-                return await self.get_by_id(translation_id)
+            if updated:
+                translation = Translation.from_mongo(updated)
+                change_feed.upserted(self.collection.name, translation.id, translation)
+                return translation
             return None
         except Exception:
             return None
@@ -55,12 +177,21 @@ class TranslationService:
         """Delete a translation by ID."""
         try:
             result = await self.collection.delete_one({"_id": ObjectId(translation_id)})
+            if result.deleted_count:
+                change_feed.removed(self.collection.name, translation_id)
             return result.deleted_count > 0
         except Exception:
             return False
 
-    async def search(self, query: str) -> List[Translation]:
+    async def search(self, query: str, limit: int = 50) -> List[Translation]:
         """Search translations by kelma, english, or root."""
+        if translation_index.ready:
+            return translation_index.search(query, limit)
+        return await self._regex_search(query, limit)
+
+    @coalesced
+    async def _regex_search(self, query: str, limit: int) -> List[Translation]:
+        """Search MongoDB with case-insensitive regexes, until the in-process index is loaded."""
         cursor = self.collection.find({
             "$or": [
                 {"kelma": {"$regex": query, "$options": "i"}},
@@ -68,11 +199,13 @@ class TranslationService:
                 {"root": {"$regex": query, "$options": "i"}}
             ]
         })
-        translations = await cursor.to_list(length=None)
-        return [Translation(**{**trans, "_id": str(trans["_id"])}) for trans in translations]
+        translations = await cursor.to_list(length=limit)
+        return [Translation.from_mongo(trans) for trans in translations]
 
+    @cached
+    @coalesced
     async def get_by_root(self, root: str) -> List[Translation]:
         """Get all translations for a specific root."""
         cursor = self.collection.find({"root": root})
         translations = await cursor.to_list(length=None)
-        return [Translation(**{**trans, "_id": str(trans["_id"])}) for trans in translations]
+        return [Translation.from_mongo(trans) for trans in translations]
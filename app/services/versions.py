@@ -0,0 +1,88 @@
+import hashlib
+import uuid
+from collections import defaultdict
+from typing import Dict
+from pydantic import BaseModel
+
+from .changes import ChangeListener, change_feed
+
+_DIGEST_MODULUS = 1 << 128
+
+
+def _fingerprint(doc_id: str, document: BaseModel) -> int:
+    """128-bit hash of one entry's ID and content."""
+    digest = hashlib.blake2b(doc_id.encode() + document.model_dump_json().encode(), digest_size=16).digest()
+    return int.from_bytes(digest, "little")
+
+
+class CollectionVersions:
+    """Per-collection generation counters, bumped on every write, and content digests.
+
+    Generations are local to this process and key its caches. Digests are the sum
+    of the entries' fingerprints, so processes holding the same data agree on
+    them whatever order they applied the writes in; stamps derive from digests.
+    """
+
+    def __init__(self):
+        self._epoch = uuid.uuid4().hex[:12]
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._digests: Dict[str, int] = defaultdict(int)
+        self._fingerprints: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._pinned: Dict[str, str] = {}
+
+    def generation(self, collection: str) -> int:
+        """Current generation of a collection."""
+        return self._generations[collection]
+
+    def stamp(self, collection: str) -> str:
+        """Opaque version stamp of a collection's content, shared by the workers of one server."""
+        if collection in self._pinned:
+            return self._pinned[collection]
+        return f"{self._epoch}.{self._digests[collection]:032x}"
+
+    def bump(self, collection: str) -> None:
+        """Mark a collection as changed."""
+        self._generations[collection] += 1
+
+    def pin(self, collection: str, stamp: str) -> None:
+        """Use a fixed stamp for a collection that is not fed by writes, such as a mapped snapshot."""
+        self._pinned[collection] = stamp
+        self.bump(collection)
+
+    def _set(self, collection: str, doc_id: str, fingerprint: int) -> None:
+        """Replace an entry's contribution to the collection digest (0 removes it)."""
+        fingerprints = self._fingerprints[collection]
+        previous = fingerprints.pop(doc_id, 0)
+        if fingerprint:
+            fingerprints[doc_id] = fingerprint
+        self._digests[collection] = (self._digests[collection] - previous + fingerprint) % _DIGEST_MODULUS
+        self.bump(collection)
+
+    def _reset(self, collection: str) -> None:
+        """Forget a collection's content before a full reload."""
+        self._fingerprints[collection] = {}
+        self._digests[collection] = 0
+        self.bump(collection)
+
+
+class _VersionListener(ChangeListener):
+    """Bumps a collection's generation and updates its digest whenever it changes."""
+
+    def __init__(self, versions: CollectionVersions, collection: str):
+        self._versions = versions
+        self._collection = collection
+
+    def clear(self) -> None:
+        self._versions._reset(self._collection)
+
+    def upsert(self, doc_id: str, document: BaseModel) -> None:
+        self._versions._set(self._collection, doc_id, _fingerprint(doc_id, document))
+
+    def remove(self, doc_id: str) -> None:
+        self._versions._set(self._collection, doc_id, 0)
+
+
+collection_versions = CollectionVersions()
+
+for _collection in ("roots", "translations"):
+    change_feed.subscribe(_collection, _VersionListener(collection_versions, _collection))
@@ -0,0 +1,42 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from ..models.root import Root
+from ..models.translation import Translation
+from .changes import change_feed
+from .lookup_index import form_keys, root_forms, translation_forms
+from .root_service import RootService
+from .translation_service import TranslationService
+
+
+async def load_collection(db: AsyncIOMotorDatabase, collection: str) -> None:
+    """(Re)load one collection into the in-process indexes."""
+    service = RootService(db) if collection == "roots" else TranslationService(db)
+    change_feed.reset(collection)
+    async for entry in service.iter_all(batch_size=1000):
+        change_feed.upserted(collection, entry.id, entry)
+    change_feed.loaded(collection)
+    print(f"Loaded {collection} into in-process indexes")
+
+
+async def load_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Load every root and translation into the in-process indexes."""
+    for collection in ("roots", "translations"):
+        await load_collection(db, collection)
+
+
+async def materialize_forms(db: AsyncIOMotorDatabase) -> None:
+    """Fill the `forms` lookup field on entries written before it existed."""
+    for collection, model, extract in (
+        (db.roots, Root, root_forms),
+        (db.translations, Translation, translation_forms),
+    ):
+        updates = []
+        async for document in collection.find({"forms": {"$exists": False}}):
+            forms = form_keys(extract(model.from_mongo(document)))
+            updates.append(UpdateOne({"_id": document["_id"]}, {"$set": {"forms": forms}}))
+            if len(updates) >= 1000:
+                await collection.bulk_write(updates, ordered=False)
+                updates = []
+        if updates:
+            await collection.bulk_write(updates, ordered=False)
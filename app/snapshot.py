@@ -0,0 +1,37 @@
+"""Build a read-only dictionary snapshot from MongoDB.
+
+Usage:
+    python -m app.snapshot OUTPUT [--watch SECONDS]
+
+With --watch, the snapshot is rebuilt every SECONDS; each rebuild atomically
+replaces OUTPUT, and API instances started with SNAPSHOT_PATH=OUTPUT remap it.
+"""
+import argparse
+import asyncio
+import time
+
+from .config.database import MongoDB, get_db
+from .services.snapshot import build_snapshot
+
+
+async def main(output: str, watch: float) -> None:
+    """Build the snapshot once, or keep rebuilding it."""
+    await MongoDB.connect_db()
+    try:
+        while True:
+            started = time.perf_counter()
+            counts = await build_snapshot(get_db(), output)
+            print(f"Wrote {output} {counts} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            if not watch:
+                break
+            await asyncio.sleep(watch)
+    finally:
+        await MongoDB.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="path of the snapshot file to write")
+    parser.add_argument("--watch", type=float, default=0, help="rebuild every this many seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.output, args.watch))
@@ -0,0 +1,83 @@
+"""Shared helpers for the benchmark scripts: synthetic lexicons, database access and statistics."""
+import os
+import random
+import string
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+BENCH_MONGODB_URI = os.environ.get("BENCH_MONGODB_URI", "mongodb://localhost:27017")
+BENCH_DATABASE = os.environ.get("BENCH_DATABASE", "kelma_bench")
+
+# The app settings require a MongoDB URI at import time
+os.environ.setdefault("MONGODB_URI", BENCH_MONGODB_URI)
+
+CATEGORIES = [
+    "adjective", "adverb", "conjunction", "interjection",
+    "noun", "numeral", "prefix", "pronoun", "quantifier", "suffix", "verb",
+]
+
+
+def make_client(mock: bool = False):
+    """Open a client on the local benchmark mongod, or an in-process mongomock stand-in."""
+    if mock:
+        from mongomock_motor import AsyncMongoMockClient
+        return AsyncMongoMockClient()
+    return AsyncIOMotorClient(BENCH_MONGODB_URI)
+
+
+def _word(rng: random.Random, low: int = 3, high: int = 9) -> str:
+    """A random lowercase pseudo-word."""
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(low, high)))
+
+
+def make_root(rng: random.Random, index: int) -> Dict:
+    """A synthetic root document compatible with RootCreate."""
+    return {
+        "root": f"{_word(rng, 2, 4)}{index}",
+        "mode": {"base": {"prim": _word(rng), "act_agt": _word(rng)}, "long": None, "strong": None},
+    }
+
+
+def make_translation(rng: random.Random, index: int, root: str = None) -> Dict:
+    """A synthetic translation document compatible with TranslationCreate."""
+    kelma = f"{_word(rng)}{index}"
+    translation = {
+        "kelma": kelma,
+        "english": f"{_word(rng)} {_word(rng)}",
+        "root": root,
+        "swadesh": rng.random() < 0.05,
+        "cat": rng.choice(CATEGORIES),
+    }
+    if translation["cat"] == "noun":
+        translation["noun_type"] = rng.choice(["primary", "radical", "deverbal"])
+        translation["noun_fields"] = {
+            "abs_plural": kelma + "i", "erg_plural": kelma + "ek", "gen_plural": kelma + "en",
+            "dat_plural": kelma + "et", "par": kelma + "sa",
+        }
+    if translation["cat"] == "verb":
+        translation["verb_fields"] = {
+            "inf_i": kelma + "i", "prog_stem": kelma[:-1], "perf_stem": kelma[:-2] + "a",
+            "n_part": kelma + "n", "t_part": kelma + "t", "s_part": kelma + "s", "v_part": kelma + "v",
+        }
+    return {k: v for k, v in translation.items() if v is not None}
+
+
+def make_lexicon(size: int, seed: int = 0) -> (List[Dict], List[Dict]):
+    """Roots and translations for a lexicon of `size` translations (about ten per root)."""
+    rng = random.Random(seed)
+    roots = [make_root(rng, i) for i in range(max(1, size // 10))]
+    translations = [make_translation(rng, i, rng.choice(roots)["root"]) for i in range(size)]
+    return roots, translations
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latency samples, in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def pick(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
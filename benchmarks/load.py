@@ -0,0 +1,432 @@
+"""Load-test every roots and translations route against synthetic lexicons.
+
+Usage:
+    python -m benchmarks.load [--sizes 1000,100000,1000000] [--concurrency 32] [--duration 5]
+                              [--routes SUBSTRING] [--mock] [--workers N] [--output PATH]
+    python -m benchmarks.load --compare OLD.json NEW.json
+
+For each lexicon size the benchmark database is dropped and seeded with that
+many translations (and a tenth as many roots), then each route is driven by
+`--concurrency` async clients for `--duration` seconds. By default the API runs
+as a uvicorn subprocess against BENCH_MONGODB_URI (under gunicorn with
+--workers above 1, as in production); with --mock it runs in-process on
+mongomock-motor. Throughput, p50/p95/p99 latency and server RSS
+are written as JSON (default benchmarks/results/load-<commit>-<time>.json) so
+runs can be compared across commits with --compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .common import BENCH_DATABASE, BENCH_MONGODB_URI, make_client, make_lexicon, make_root, make_translation, percentiles
+
+os.environ.setdefault("DATABASE_NAME", BENCH_DATABASE)
+# Don't let full-collection polling (standalone mongod only) skew the numbers
+os.environ.setdefault("SYNC_POLL_SECONDS", "3600")
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+SEED_CHUNK = 10000
+SAMPLE_SIZE = 1000
+# Routes that return the whole collection are skipped above this size
+FULL_DUMP_MAX_SIZE = 100000
+
+Request = Tuple[str, str, Optional[dict]]
+
+
+class Workload:
+    """Seeded data the scenarios draw request parameters from, plus entries created during the run."""
+
+    def __init__(self, roots: List[Dict], translations: List[Dict], root_ids: List[str], translation_ids: List[str]):
+        self.rng = random.Random(1)
+        self.root_values = [root["root"] for root in roots[:SAMPLE_SIZE]]
+        self.kelmas = [translation["kelma"] for translation in translations[:SAMPLE_SIZE]]
+        self.root_ids = root_ids[:SAMPLE_SIZE]
+        self.translation_ids = translation_ids[:SAMPLE_SIZE]
+        self.created: Dict[str, List[str]] = {"roots": [], "translations": []}
+        self._counter = 0
+
+    def pick(self, values: List[str]) -> str:
+        """A random element of a sample."""
+        return self.rng.choice(values)
+
+    def next_index(self) -> int:
+        """A fresh index for synthetic entries, unique within the run."""
+        self._counter += 1
+        return 10_000_000 + self._counter
+
+    def new_root(self) -> dict:
+        """A root payload whose value does not collide with seeded roots."""
+        root = make_root(self.rng, self.next_index())
+        root["root"] = f"bench{self._counter}"
+        return root
+
+    def new_translation(self) -> dict:
+        """A translation payload."""
+        return make_translation(self.rng, self.next_index(), self.pick(self.root_values))
+
+    def take_created(self, collection: str) -> Optional[str]:
+        """An ID created earlier in the run, removed from the pool."""
+        created = self.created[collection]
+        return created.pop() if created else None
+
+
+class Scenario:
+    """One route under load: how to build a request and what to do with the response."""
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[Workload], Optional[Request]],
+        on_response: Optional[Callable[[Workload, httpx.Response], None]] = None,
+        max_size: Optional[int] = None,
+    ):
+        self.name = name
+        self.build = build
+        self.on_response = on_response
+        self.max_size = max_size
+
+
+def _remember(collection: str):
+    """Response hook that keeps the IDs of created entries for the update and delete scenarios."""
+    def hook(workload: Workload, response: httpx.Response) -> None:
+        if response.status_code == 201:
+            workload.created[collection].append(response.json()["_id"])
+    return hook
+
+
+def _with_created(collection: str, build: Callable[[str], Request]):
+    """Build a request against an entry created earlier in the run."""
+    def builder(workload: Workload) -> Optional[Request]:
+        doc_id = workload.take_created(collection)
+        return build(doc_id) if doc_id else None
+    return builder
+
+
+def _reuse_created(collection: str):
+    """Response hook that puts an updated entry back in the pool."""
+    def hook(workload: Workload, response: httpx.Response) -> None:
+        if response.status_code == 200:
+            workload.created[collection].append(response.json()["_id"])
+    return hook
+
+
+SCENARIOS: List[Scenario] = [
+    # Translations
+    Scenario("GET /api/translations", lambda w: ("GET", "/api/translations", None), max_size=FULL_DUMP_MAX_SIZE),
+    Scenario("GET /api/translations?limit=100", lambda w: (
+        "GET", f"/api/translations?limit=100&after={w.pick(w.translation_ids)}", None
+    )),
+    Scenario("GET /api/translations?fields=kelma,english", lambda w: (
+        "GET", f"/api/translations?limit=100&fields=kelma,english&after={w.pick(w.translation_ids)}", None
+    )),
+    Scenario("GET /api/translations?cat=noun", lambda w: ("GET", "/api/translations?cat=noun&limit=100", None)),
+    Scenario("GET /api/translations?sort=kelma", lambda w: ("GET", "/api/translations?sort=kelma&limit=100", None)),
+    Scenario("GET /api/translations?stream=true", lambda w: (
+        "GET", "/api/translations?stream=true", None
+    ), max_size=FULL_DUMP_MAX_SIZE),
+    Scenario("GET /api/translations/search", lambda w: (
+        "GET", f"/api/translations/search?q={w.pick(w.kelmas)[:4]}", None
+    )),
+    Scenario("GET /api/translations/by-root/{root}", lambda w: (
+        "GET", f"/api/translations/by-root/{w.pick(w.root_values)}", None
+    )),
+    Scenario("GET /api/translations/facets", lambda w: ("GET", "/api/translations/facets", None)),
+    Scenario("GET /api/translations/{id}", lambda w: ("GET", f"/api/translations/{w.pick(w.translation_ids)}", None)),
+    Scenario("GET /api/translations/export", lambda w: (
+        "GET", "/api/translations/export", None
+    ), max_size=FULL_DUMP_MAX_SIZE),
+    Scenario("POST /api/translations", lambda w: (
+        "POST", "/api/translations", w.new_translation()
+    ), _remember("translations")),
+    Scenario("POST /api/translations/bulk", lambda w: (
+        "POST", "/api/translations/bulk", [w.new_translation() for _ in range(50)]
+    )),
+    Scenario("PUT /api/translations/{id}", _with_created("translations", lambda doc_id: (
+        "PUT", f"/api/translations/{doc_id}", {"english": f"updated {doc_id[-6:]}"}
+    )), _reuse_created("translations")),
+    Scenario("DELETE /api/translations/{id}", _with_created("translations", lambda doc_id: (
+        "DELETE", f"/api/translations/{doc_id}", None
+    ))),
+    # Roots
+    Scenario("GET /api/roots", lambda w: ("GET", "/api/roots", None), max_size=FULL_DUMP_MAX_SIZE),
+    Scenario("GET /api/roots?limit=100", lambda w: (
+        "GET", f"/api/roots?limit=100&after={w.pick(w.root_ids)}", None
+    )),
+    Scenario("GET /api/roots/search", lambda w: ("GET", f"/api/roots/search?q={w.pick(w.root_values)[:3]}", None)),
+    Scenario("GET /api/roots/by-value/{value}", lambda w: (
+        "GET", f"/api/roots/by-value/{w.pick(w.root_values)}", None
+    )),
+    Scenario("GET /api/roots/{id}", lambda w: ("GET", f"/api/roots/{w.pick(w.root_ids)}", None)),
+    Scenario("GET /api/roots/export", lambda w: ("GET", "/api/roots/export", None), max_size=FULL_DUMP_MAX_SIZE),
+    Scenario("POST /api/roots", lambda w: ("POST", "/api/roots", w.new_root()), _remember("roots")),
+    Scenario("POST /api/roots/bulk", lambda w: ("POST", "/api/roots/bulk", [w.new_root() for _ in range(50)])),
+    Scenario("PUT /api/roots/{id}", _with_created("roots", lambda doc_id: (
+        "PUT", f"/api/roots/{doc_id}", {"mode": {"base": {"prim": f"updated {doc_id[-6:]}"}}}
+    )), _reuse_created("roots")),
+    Scenario("DELETE /api/roots/{id}", _with_created("roots", lambda doc_id: ("DELETE", f"/api/roots/{doc_id}", None))),
+]
+
+
+# --- Seeding ------------------------------------------------------------------
+
+async def seed(db, size: int) -> Workload:
+    """Drop the benchmark collections and insert a synthetic lexicon of `size` translations."""
+    roots, translations = make_lexicon(size)
+    await db.roots.drop()
+    await db.translations.drop()
+    root_ids, translation_ids = [], []
+    for collection, documents, ids in ((db.roots, roots, root_ids), (db.translations, translations, translation_ids)):
+        for start in range(0, len(documents), SEED_CHUNK):
+            # Insert copies: insert_many adds `_id` to the dicts it is given
+            chunk = [dict(document) for document in documents[start:start + SEED_CHUNK]]
+            result = await collection.insert_many(chunk, ordered=False)
+            ids.extend(str(inserted) for inserted in result.inserted_ids)
+    # The API materializes the `forms` lookup field for these documents at startup
+    return Workload(roots, translations, root_ids, translation_ids)
+
+
+# --- Driving ------------------------------------------------------------------
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, workload: Workload, concurrency: int,
+                duration: float) -> dict:
+    """Run one scenario with `concurrency` clients for `duration` seconds."""
+    samples: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            request = scenario.build(workload)
+            if request is None:
+                return
+            method, url, body = request
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+            except httpx.HTTPError:
+                errors += 1
+                samples.append(time.perf_counter() - started)
+                continue
+            samples.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            elif scenario.on_response is not None:
+                scenario.on_response(workload, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {name: round(value, 3) for name, value in percentiles(samples).items()},
+    }
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Resident set size of a process and its children in MiB, from /proc (Linux only).
+
+    Pages shared between forked workers are counted once per worker.
+    """
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            kib = next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            child_pids = [int(child) for child in children.read().split()]
+    except (OSError, StopIteration):
+        return None
+    return round(kib / 1024 + sum(rss_mb(child) or 0.0 for child in child_pids), 1)
+
+
+class Server:
+    """The API under test: a uvicorn subprocess, or the app in-process on mongomock."""
+
+    def __init__(self, mock: bool, mock_client=None, port: int = 8765, workers: int = 1):
+        self.mock = mock
+        self.mock_client = mock_client
+        self.port = port
+        self.workers = workers
+        self.pid: Optional[int] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._lifespan = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        if self.mock:
+            from app.config.database import MongoDB
+            from app.main import app, lifespan
+
+            async def connect_mock():
+                MongoDB.client = self.mock_client
+
+            MongoDB.connect_db = connect_mock
+            self._lifespan = lifespan(app)
+            await self._lifespan.__aenter__()
+            self._client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+            )
+            return self._client
+
+        env = {**os.environ, "MONGODB_URI": BENCH_MONGODB_URI, "DATABASE_NAME": BENCH_DATABASE}
+        if self.workers > 1:
+            command = [
+                sys.executable, "-m", "gunicorn", "app.main:app", "--config", "gunicorn.conf.py",
+                "--bind", f"127.0.0.1:{self.port}", "--workers", str(self.workers), "--log-level", "warning",
+            ]
+        else:
+            command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(self.port), "--log-level", "warning"]
+        self._process = subprocess.Popen(command, env=env)
+        self.pid = self._process.pid
+        self._client = client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{self.port}", timeout=None)
+        # Startup loads the in-process indexes, which takes a while on large lexicons
+        deadline = time.monotonic() + 900
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError("API server exited during startup")
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return client
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+        raise RuntimeError("API server did not become ready")
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        if self._lifespan is not None:
+            await self._lifespan.__aexit__(None, None, None)
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait(timeout=30)
+
+
+async def run_size(size: int, args: argparse.Namespace) -> dict:
+    """Seed one lexicon size and drive every selected route against it."""
+    db_client = make_client(args.mock)
+    db = db_client[BENCH_DATABASE]
+    started = time.perf_counter()
+    workload = await seed(db, size)
+    seed_seconds = time.perf_counter() - started
+    print(f"Seeded {size} translations in {seed_seconds:.1f}s", file=sys.stderr)
+
+    routes = {}
+    peak_rss = 0.0
+    server = Server(args.mock, db_client if args.mock else None, workers=args.workers)
+    started = time.perf_counter()
+    try:
+        async with server as client:
+            startup_seconds = time.perf_counter() - started
+            rss_after_startup = rss_mb(server.pid)
+            peak_rss = rss_after_startup or 0.0
+            for scenario in SCENARIOS:
+                if args.routes and args.routes not in scenario.name:
+                    continue
+                if scenario.max_size is not None and size > scenario.max_size:
+                    continue
+                routes[scenario.name] = await drive(client, scenario, workload, args.concurrency, args.duration)
+                peak_rss = max(peak_rss, rss_mb(server.pid) or 0.0)
+                print(f"  {scenario.name}: {routes[scenario.name]}", file=sys.stderr)
+    finally:
+        if not args.mock:
+            await db.roots.drop()
+            await db.translations.drop()
+        db_client.close()
+
+    return {
+        "seed_seconds": round(seed_seconds, 2),
+        "startup_seconds": round(startup_seconds, 2),
+        "rss_mb": {"after_startup": rss_after_startup, "peak": peak_rss or None},
+        "routes": routes,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree being benchmarked."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Run every size and save the results as JSON."""
+    results = {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "mock": args.mock,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "duration_seconds": args.duration,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        results["sizes"][str(size)] = await run_size(size, args)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{results['commit'] or 'unknown'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}", file=sys.stderr)
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print throughput and latency changes between two result files."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for size, new_size in new["sizes"].items():
+        old_routes = old["sizes"].get(size, {}).get("routes", {})
+        print(f"\n{size} translations")
+        for route, result in new_size["routes"].items():
+            before = old_routes.get(route)
+            if before is None:
+                continue
+            changes = [f"rps {_change(before['throughput_rps'], result['throughput_rps'])}"]
+            for name in ("p50", "p95", "p99"):
+                changes.append(f"{name} {_change(before['latency_ms'][name], result['latency_ms'][name])}")
+            print(f"  {route:<50} {'  '.join(changes)}")
+
+
+def _change(before: float, after: float) -> str:
+    """Relative change as a signed percentage."""
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[1000, 100000, 1000000], help="comma-separated lexicon sizes (translations)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per route")
+    parser.add_argument("--routes", help="only run routes whose name contains this text")
+    parser.add_argument("--mock", action="store_true", help="run the app in-process on mongomock-motor")
+    parser.add_argument("--workers", type=int, default=1, help="API worker processes (ignored with --mock)")
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,72 @@
+"""Serialize translations through the validating path and the trusted-read path.
+
+Usage:
+    python -m benchmarks.serialization [--count N] [--repeat R]
+
+The validating path mirrors what list endpoints did before: rebuild each
+document with full validation, then let FastAPI dump, re-validate against
+response_model and encode with json.dumps. The trusted path builds models with
+Translation.from_mongo and renders bytes with a TypeAdapter, as the routes do now.
+"""
+import argparse
+import json
+import random
+import time
+from typing import List
+
+from bson import ObjectId
+
+from .common import make_translation
+from app.models.translation import Translation
+from app.routes.responses import json_response
+
+LIST_ADAPTER_TYPE = List[Translation]
+
+
+def validating_path(documents: list) -> bytes:
+    """Full validation on read, response_model re-validation, then json.dumps."""
+    from pydantic import TypeAdapter
+
+    adapter = TypeAdapter(LIST_ADAPTER_TYPE)
+    models = [Translation(**{**doc, "_id": str(doc["_id"])}) for doc in documents]
+    revalidated = adapter.validate_python([model.model_dump(by_alias=True) for model in models])
+    content = adapter.dump_python(revalidated, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def trusted_path(documents: list) -> bytes:
+    """Construct without validation and render bytes directly."""
+    return json_response([Translation.from_mongo(doc) for doc in documents], LIST_ADAPTER_TYPE).body
+
+
+def best_of(function, documents: list, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(documents)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main(count: int, repeat: int) -> None:
+    """Print timings of both paths as JSON."""
+    rng = random.Random(0)
+    documents = [{**make_translation(rng, i), "_id": ObjectId()} for i in range(count)]
+    assert json.loads(validating_path(documents)) == json.loads(trusted_path(documents))
+    validating = best_of(validating_path, documents, repeat)
+    trusted = best_of(trusted_path, documents, repeat)
+    print(json.dumps({
+        "count": count,
+        "validating_ms": round(validating, 2),
+        "trusted_ms": round(trusted, 2),
+        "speedup": round(validating / trusted, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.count, args.repeat)
@@ -0,0 +1,83 @@
+"""Compare write latency of the old read-after-write path with the services' single round-trip path.
+
+Usage:
+    python -m benchmarks.write_latency [--writes N] [--mock]
+
+Runs against BENCH_MONGODB_URI (default mongodb://localhost:27017), or against
+mongomock-motor with --mock.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from bson import ObjectId
+
+from .common import BENCH_DATABASE, make_client, make_translation, percentiles
+from app.models.translation import Translation, TranslationCreate, TranslationUpdate
+from app.services.translation_service import TranslationService
+
+
+async def legacy_create(collection, data: TranslationCreate) -> Translation:
+    """Create with insert_one followed by a find_one re-read."""
+    result = await collection.insert_one(data.model_dump(exclude_none=True))
+    created = await collection.find_one({"_id": result.inserted_id})
+    return Translation(**{**created, "_id": str(created["_id"])})
+
+
+async def legacy_update(collection, translation_id: str, update: dict) -> Translation:
+    """Update with update_one followed by a find_one re-read."""
+    await collection.update_one({"_id": ObjectId(translation_id)}, {"$set": update})
+    updated = await collection.find_one({"_id": ObjectId(translation_id)})
+    return Translation(**{**updated, "_id": str(updated["_id"])})
+
+
+async def measure(operation, count: int) -> dict:
+    """Time `count` sequential calls of an async operation."""
+    samples = []
+    for i in range(count):
+        started = time.perf_counter()
+        await operation(i)
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+async def main(writes: int, mock: bool) -> None:
+    """Run each write path `writes` times and print latency percentiles as JSON."""
+    client = make_client(mock)
+    db = client[BENCH_DATABASE]
+    await db.translations.drop()
+    service = TranslationService(db)
+    rng = random.Random(0)
+    payloads = [TranslationCreate(**make_translation(rng, i)) for i in range(writes)]
+
+    results = {}
+    created = []
+
+    async def create_legacy(i):
+        created.append((await legacy_create(db.translations, payloads[i])).id)
+
+    async def create_single(i):
+        await service.create(payloads[i])
+
+    results["create_legacy"] = await measure(create_legacy, writes)
+    results["create_single"] = await measure(create_single, writes)
+    results["update_legacy"] = await measure(
+        lambda i: legacy_update(db.translations, created[i], {"english": f"legacy {i}"}), writes
+    )
+    results["update_single"] = await measure(
+        lambda i: service.update(created[i], TranslationUpdate(english=f"single {i}")), writes
+    )
+
+    await db.translations.drop()
+    client.close()
+    print(json.dumps({"writes": writes, "mock": mock, "latency_ms": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--mock", action="store_true", help="use mongomock-motor instead of a local mongod")
+    args = parser.parse_args()
+    asyncio.run(main(args.writes, args.mock))
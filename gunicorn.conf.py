@@ -0,0 +1,60 @@
+"""Production server: gunicorn managing uvicorn workers, one per available core by default.
+
+Available cores are limited by the CPU affinity mask and the cgroup CPU quota;
+set `WORKERS` to override.
+
+The app is imported and its in-process state loaded once in the master, then
+forked into every worker. `kill -HUP <master>` reloads that state and replaces
+the workers one generation at a time without dropping connections.
+"""
+import math
+import os
+
+from app import prefork
+
+
+def available_cpus() -> int:
+    """Cores this process may run on, reduced to its cgroup CPU quota when one is set."""
+    cpus = len(os.sched_getaffinity(0))
+    for quota_file, period_file in (
+        ("/sys/fs/cgroup/cpu.max", None),
+        ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "/sys/fs/cgroup/cpu/cpu.cfs_period_us"),
+    ):
+        try:
+            with open(quota_file) as f:
+                fields = f.read().split()
+            if period_file is not None:
+                with open(period_file) as f:
+                    fields.append(f.read().strip())
+        except OSError:
+            continue
+        quota, period = fields[0], fields[1]
+        if quota not in ("max", "-1"):
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+        break
+    return cpus
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WORKERS") or available_cpus())
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+# Indexes are loaded before forking, so workers boot quickly
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    """Load the in-process state before the first workers are forked."""
+    prefork.prime()
+
+
+def on_reload(server):
+    """Reload the in-process state before the next generation of workers is forked."""
+    prefork.prime()
+
+
+def post_fork(server, worker):
+    """Give each worker its own MongoDB client."""
+    prefork.after_fork()
@@ -1,2 +1,3 @@
 #!/bin/bash
-uvicorn app.main:app --host 0.0.0.0 --port $PORT
+# WORKERS defaults to the number of available cores
+exec gunicorn app.main:app --config gunicorn.conf.py
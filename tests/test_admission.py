@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.root import Root
+from app.routes import admission as admission_routes
+from app.routes.admission import Admitted, admit
+from app.routes.streaming import ndjson_response
+from app.services import admission as admission_module
+from app.services.admission import AdmissionControl, ConcurrencyLimiter, TokenBuckets, TrustedProxies
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission_module.time, "monotonic", clock)
+    return clock
+
+
+def test_buckets_allow_a_burst_then_the_rate(clock):
+    buckets = TokenBuckets(rate=2.0, burst=3)
+    assert [buckets.take("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.take("a") == pytest.approx(0.5)
+    assert buckets.take("b") == 0.0
+    clock.now += 0.5
+    assert buckets.take("a") == 0.0
+    assert buckets.take("a") == pytest.approx(0.5)
+
+
+def test_buckets_refill_only_up_to_the_burst(clock):
+    buckets = TokenBuckets(rate=1.0, burst=2)
+    buckets.take("a")
+    clock.now += 60
+    assert [buckets.take("a") for _ in range(3)][-1] == pytest.approx(1.0)
+
+
+def test_disabled_buckets():
+    assert not TokenBuckets(rate=0.0, burst=20).enabled
+
+
+def test_release_hands_the_slot_to_the_longest_waiting_request():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, queue_size=2)
+        assert await limiter.acquire(1.0)
+        order = []
+
+        async def wait(name):
+            assert await limiter.acquire(1.0)
+            order.append(name)
+
+        first = asyncio.create_task(wait("first"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(wait("second"))
+        await asyncio.sleep(0)
+        # Queue full: the next request is turned away without waiting
+        assert not await limiter.acquire(1.0)
+
+        limiter.release()
+        await first
+        assert (order, limiter.active) == (["first"], 1)
+        limiter.release()
+        await second
+        limiter.release()
+        assert (order, limiter.active) == (["first", "second"], 0)
+
+    asyncio.run(scenario())
+
+
+def test_waiting_times_out_and_leaves_the_queue():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, queue_size=1)
+        assert await limiter.acquire(1.0)
+        assert not await limiter.acquire(0.01)
+        assert len(limiter._waiters) == 0
+        limiter.release()
+        assert limiter.active == 0
+        assert await limiter.acquire(0.01)
+
+    asyncio.run(scenario())
+
+
+def test_a_slot_handed_to_a_cancelled_waiter_is_passed_on():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, queue_size=2)
+        assert await limiter.acquire(1.0)
+        doomed = asyncio.create_task(limiter.acquire(1.0))
+        await asyncio.sleep(0)
+        patient = asyncio.create_task(limiter.acquire(1.0))
+        await asyncio.sleep(0)
+        limiter.release()
+        doomed.cancel()
+        assert await patient
+        assert limiter.active == 1
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("peer, forwarded_for, client", [
+    ("203.0.113.7", None, "203.0.113.7"),
+    # Untrusted peers cannot choose their address
+    ("203.0.113.7", "198.51.100.1", "203.0.113.7"),
+    ("10.0.0.2", "198.51.100.1", "198.51.100.1"),
+    # Hops a client put in front of the real one are ignored
+    ("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.3", "198.51.100.1"),
+    ("10.0.0.2", "10.0.0.5", "10.0.0.5"),
+    (None, "198.51.100.1", "unknown"),
+])
+def test_client_address_behind_trusted_proxies(peer, forwarded_for, client):
+    assert TrustedProxies("127.0.0.1, 10.0.0.0/8").client(peer, forwarded_for) == client
+
+
+def test_wildcard_trusts_every_peer():
+    assert TrustedProxies("*").client("203.0.113.7", "198.51.100.1") == "198.51.100.1"
+
+
+def test_streamed_responses_hold_their_slot_until_the_stream_ends(monkeypatch):
+    control = AdmissionControl(1, 0, "", 0.0, 1, "")
+    monkeypatch.setattr(admission_routes, "admission", control)
+    active_while_streaming = []
+
+    async def roots():
+        for value in ("k-t-b", "s-l-m"):
+            active_while_streaming.append(control.limiter("roots.export").active)
+            yield Root.from_mongo({"_id": "0" * 24, "root": value, "mode": {"base": {"prim": value}}})
+
+    app = FastAPI()
+
+    @app.get("/export")
+    async def export(admitted: Admitted = Depends(admit("roots.export"))):
+        return ndjson_response(admitted.stream(roots()))
+
+    @app.get("/failing")
+    async def failing(admitted: Admitted = Depends(admit("roots.export"))):
+        admitted.stream(roots())
+        raise ValueError("before the response")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    assert client.get("/export").text.count("\n") == 2
+    assert active_while_streaming == [1, 1]
+    assert control.limiter("roots.export").active == 0
+    assert client.get("/failing").status_code == 500
+    assert control.limiter("roots.export").active == 0
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.services.coalesce import SingleFlight
+from app.services.versions import CollectionVersions
+
+
+class Loader:
+    """Counts loads and holds them until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+
+def test_concurrent_identical_calls_share_one_load():
+    async def scenario():
+        flights = SingleFlight(CollectionVersions())
+        loader = Loader()
+        callers = [asyncio.create_task(flights.do("roots", "get_all", "key", loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        assert await asyncio.gather(*callers) == [1] * 5
+        assert (flights.executed, flights.coalesced, loader.calls) == (1, 4, 1)
+        assert flights.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_a_write_starts_a_new_load():
+    async def scenario():
+        versions = CollectionVersions()
+        flights = SingleFlight(versions)
+        loader = Loader()
+        before = asyncio.create_task(flights.do("roots", "get_all", "key", loader))
+        await asyncio.sleep(0)
+        versions.bump("roots")
+        after = asyncio.create_task(flights.do("roots", "get_all", "key", loader))
+        await asyncio.sleep(0)
+        loader.release.set()
+        await asyncio.gather(before, after)
+        assert loader.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flights = SingleFlight(CollectionVersions())
+        loader = Loader()
+        first = asyncio.create_task(flights.do("roots", "get_all", "key", loader))
+        second = asyncio.create_task(flights.do("roots", "get_all", "key", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        loader.release.set()
+        assert await second == 1
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_caller_and_are_not_kept():
+    async def scenario():
+        flights = SingleFlight(CollectionVersions())
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flights.do("roots", "get_all", "key", failing) for _ in range(2)), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import base64
+import json
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+from pymongo import ASCENDING, DESCENDING
+
+from app.routes.streaming import NEXT_CURSOR_HEADER, parse_cursor, set_next_cursor
+
+DOC_ID = str(ObjectId())
+
+
+def next_cursor(items, limit, sort=None):
+    response = Response()
+    set_next_cursor(response, items, limit, sort)
+    return response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def test_id_order_cursor_is_the_last_id():
+    assert next_cursor([{"_id": DOC_ID}], 1) == DOC_ID
+    assert parse_cursor(DOC_ID, ("_id", DESCENDING)) == DOC_ID
+
+
+def test_sorted_cursor_round_trips_value_and_id():
+    sort = ("kelma", ASCENDING)
+    cursor = next_cursor([{"_id": DOC_ID, "kelma": "sélam"}], 1, sort)
+    assert parse_cursor(cursor, sort) == ("sélam", DOC_ID)
+
+
+def test_no_cursor_for_a_short_page():
+    assert next_cursor([{"_id": DOC_ID}], 2) is None
+
+
+@pytest.mark.parametrize("after", ["zzz", DOC_ID, "WyJhIiwgInh5eiJd"])
+def test_invalid_sorted_cursor_is_rejected(after):
+    with pytest.raises(HTTPException) as raised:
+        parse_cursor(after, ("english", ASCENDING))
+    assert raised.value.status_code == 400
+
+
+@pytest.mark.parametrize("value", [{"$ne": None}, {"$regex": "."}, 1, None])
+def test_sorted_cursor_rejects_values_that_are_not_strings(value):
+    after = base64.urlsafe_b64encode(json.dumps([value, DOC_ID]).encode()).decode()
+    with pytest.raises(HTTPException) as raised:
+        parse_cursor(after, ("kelma", ASCENDING))
+    assert raised.value.status_code == 400
+
+
+def test_sorted_cursor_rejects_an_injected_id():
+    after = base64.urlsafe_b64encode(json.dumps(["tarun", {"$gt": ""}]).encode()).decode()
+    with pytest.raises(HTTPException) as raised:
+        parse_cursor(after, ("kelma", ASCENDING))
+    assert raised.value.status_code == 400
@@ -0,0 +1,16 @@
+from app.routes.etag import _matches
+
+
+def test_matches_strong_tag():
+    assert _matches('"abc"', '"abc"')
+    assert not _matches('"abd"', '"abc"')
+
+
+def test_matches_weak_tags_in_either_position():
+    assert _matches('W/"abc"', '"abc"')
+    assert _matches('"abc"', 'W/"abc"')
+    assert _matches('"x", W/"abc"', '"abc"')
+
+
+def test_matches_wildcard():
+    assert _matches("*", '"abc"')
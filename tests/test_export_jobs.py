@@ -0,0 +1,79 @@
+import asyncio
+import os
+
+import pytest
+
+from app.services import export_jobs
+from app.services.export_jobs import ExportQueue
+
+
+async def fake_export(db, out):
+    await db.wait()
+    out.write("kelma,english\n")
+    return 1
+
+
+@pytest.fixture(autouse=True)
+def exporters(monkeypatch):
+    monkeypatch.setitem(export_jobs.EXPORT_FORMATS, "csv", (fake_export, ".csv", "text/csv"))
+
+
+def workers(directory, count=2, ttl_seconds=3600.0):
+    """Queues standing in for separate worker processes sharing one directory."""
+    queues = [ExportQueue() for _ in range(count)]
+    for queue in queues:
+        queue.configure(str(directory), 1, ttl_seconds)
+    return queues
+
+
+def test_any_worker_reports_and_serves_a_job(tmp_path):
+    async def scenario():
+        first, second = workers(tmp_path)
+        db = asyncio.Event()
+        job = first.submit(db, "csv")
+        await asyncio.sleep(0)
+        assert second.get(job.id).status == "running"
+        assert second.path(job.id) is None
+        db.set()
+        await first._tasks[job.id]
+        finished = second.get(job.id)
+        assert (finished.status, finished.rows) == ("done", 1)
+        with open(second.path(job.id), encoding="utf-8") as f:
+            assert f.read() == "kelma,english\n"
+        assert second.filename(job.id) == "kelma-csv.csv"
+
+    asyncio.run(scenario())
+
+
+def test_removal_through_another_worker_discards_the_result(tmp_path):
+    async def scenario():
+        first, second = workers(tmp_path)
+        db = asyncio.Event()
+        job = first.submit(db, "csv")
+        await asyncio.sleep(0)
+        assert await second.remove(job.id)
+        db.set()
+        await first._tasks[job.id]
+        assert first.get(job.id) is None
+        assert os.listdir(tmp_path) == []
+
+    asyncio.run(scenario())
+
+
+def test_sweep_expires_old_jobs_and_ignores_unknown_ids(tmp_path):
+    async def scenario():
+        first, second = workers(tmp_path, ttl_seconds=60.0)
+        db = asyncio.Event()
+        db.set()
+        job = first.submit(db, "csv")
+        await first._tasks[job.id]
+        second._expire()
+        assert second.get(job.id) is not None
+        for name in os.listdir(tmp_path):
+            os.utime(tmp_path / name, (0, 0))
+        second._expire()
+        assert second.get(job.id) is None
+        assert os.listdir(tmp_path) == []
+        assert second.get("../etc/passwd") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import fuzzy_service
+from app.services.fuzzy_index import FuzzyIndex, edit_distance, root_terms, translation_terms
+from app.services.fuzzy_service import FuzzyService
+
+
+def translation(doc_id, kelma, english):
+    return SimpleNamespace(id=doc_id, kelma=kelma, english=english)
+
+
+@pytest.fixture
+def indexes(monkeypatch):
+    translations = FuzzyIndex(translation_terms, max_distance=2, prefix_length=7)
+    roots = FuzzyIndex(root_terms, max_distance=2, prefix_length=7)
+    monkeypatch.setattr(fuzzy_service, "translation_fuzzy_index", translations)
+    monkeypatch.setattr(fuzzy_service, "root_fuzzy_index", roots)
+    for entry in [
+        translation("1", "tarun", "big house"),
+        translation("2", "selam", "to speak"),
+        translation("3", "kurak", "big dog"),
+    ]:
+        translations.upsert(entry.id, entry)
+    roots.upsert("r1", SimpleNamespace(id="r1", root="trn"))
+    return translations, roots
+
+
+def search(query, max_distance=2):
+    return [(match.distance, match.term, match.slot) for match in FuzzyService().search(query, max_distance)]
+
+
+def test_edit_distance_counts_swaps_as_one_edit():
+    assert edit_distance("tarun", "taurn", 2) == 1
+    assert edit_distance("tarun", "selam", 2) == 3
+
+
+def test_finds_terms_within_the_distance(indexes):
+    assert search("tarn") == [(1, "tarun", "kelma"), (1, "trn", "root")]
+    assert search("tarn", max_distance=0) == []
+
+
+def test_short_queries_do_not_match_everything(indexes):
+    assert search("x") == []
+
+
+def test_several_words_match_entries_close_to_every_word(indexes):
+    assert search("big dgo") == [(1, "big dog", "english")]
+    assert search("bgi dgo") == [(2, "big dog", "english")]
+    assert search("bgi dgo", max_distance=1) == []
+
+
+def test_removed_entries_are_no_longer_found(indexes):
+    translations, _ = indexes
+    translations.remove("2")
+    assert search("selam") == []
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.services.lookup_index import update_with_forms
+
+FIELDS = ("kelma", "verb_fields")
+
+
+def forms_of(document: dict):
+    return sorted(filter(None, [document.get("kelma"), (document.get("verb_fields") or {}).get("inf_i")]))
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for update_with_forms, counting round trips."""
+
+    name = "translations"
+
+    def __init__(self, document: dict, interfere: int = 0):
+        self.document = document
+        self.interfere = interfere
+        self.calls = []
+
+    async def find_one(self, query, projection=None):
+        self.calls.append("find_one")
+        found = dict(self.document)
+        if self.interfere:
+            # Another writer changes the document right after this read
+            self.interfere -= 1
+            self.document = {**self.document, "kelma": self.document["kelma"] + "!"}
+        return found
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        self.calls.append("find_one_and_update")
+        if any(self.document.get(field) != value for field, value in query.items()):
+            return None
+        self.document = {**self.document, **update["$set"]}
+        return self.document
+
+
+def run(collection, update):
+    return asyncio.run(update_with_forms(collection, 1, update, FIELDS, forms_of))
+
+
+def test_update_without_form_fields_is_one_write():
+    collection = FakeCollection({"_id": 1, "kelma": "selam", "english": "speak", "forms": ["selam"]})
+    updated = run(collection, {"english": "talk"})
+    assert collection.calls == ["find_one_and_update"]
+    assert updated["forms"] == ["selam"]
+
+
+def test_update_of_every_form_field_is_one_write():
+    collection = FakeCollection({"_id": 1, "kelma": "selam", "forms": ["selam"]})
+    updated = run(collection, {"kelma": "salam", "verb_fields": {"inf_i": "salami"}})
+    assert collection.calls == ["find_one_and_update"]
+    assert updated["forms"] == ["salam", "salami"]
+
+
+def test_partial_form_update_merges_current_values_in_the_same_write():
+    collection = FakeCollection({"_id": 1, "kelma": "selam", "verb_fields": {"inf_i": "selami"}, "forms": []})
+    updated = run(collection, {"kelma": "salam"})
+    assert collection.calls == ["find_one", "find_one_and_update"]
+    assert updated["forms"] == ["salam", "selami"]
+
+
+def test_partial_form_update_retries_after_a_concurrent_write():
+    collection = FakeCollection({"_id": 1, "kelma": "selam", "verb_fields": None, "forms": []}, interfere=1)
+    updated = run(collection, {"verb_fields": {"inf_i": "selami"}})
+    assert collection.calls == ["find_one", "find_one_and_update", "find_one", "find_one_and_update"]
+    assert updated["forms"] == ["selam!", "selami"]
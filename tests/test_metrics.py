@@ -0,0 +1,29 @@
+import threading
+
+from app.services.metrics import PoolMonitor
+
+
+def test_pool_monitor_counts_from_many_threads():
+    monitor = PoolMonitor()
+
+    def churn():
+        for _ in range(10000):
+            monitor.connection_created(None)
+            monitor.connection_checked_out(None)
+            monitor.connection_checked_in(None)
+
+    threads = [threading.Thread(target=churn) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = monitor.stats()
+    assert stats["created_total"] == 80000
+    assert stats["in_use"] == 0
+
+
+def test_pool_monitor_reset():
+    monitor = PoolMonitor()
+    monitor.connection_created(None)
+    monitor.reset()
+    assert monitor.stats()["open"] == 0
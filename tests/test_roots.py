@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import roots as roots_routes
+from app.services.root_service import RootService
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def root(value):
+    return {"root": value, "mode": {"base": {"prim": "write"}}}
+
+
+@pytest.fixture
+def client():
+    db = mongomock_motor.AsyncMongoMockClient()["kelma"]
+    asyncio.run(db.roots.create_index("root", unique=True, name="root_unique"))
+    app = FastAPI()
+    app.include_router(roots_routes.router, prefix="/api")
+    app.dependency_overrides[roots_routes.get_root_service] = lambda: RootService(db)
+    return TestClient(app)
+
+
+def test_creating_an_existing_root_conflicts(client):
+    assert client.post("/api/roots", json=root("k-t-b")).status_code == 201
+
+    response = client.post("/api/roots", json=root("k-t-b"))
+
+    assert response.status_code == 409
+
+
+def test_renaming_a_root_to_an_existing_one_conflicts(client):
+    client.post("/api/roots", json=root("k-t-b"))
+    root_id = client.post("/api/roots", json=root("s-l-m")).json()["_id"]
+
+    response = client.put(f"/api/roots/{root_id}", json={"root": "k-t-b"})
+
+    assert response.status_code == 409
+    assert client.get(f"/api/roots/{root_id}").json()["root"] == "s-l-m"
@@ -0,0 +1,76 @@
+import asyncio
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from app.models.translation import Translation
+from app.services.snapshot import Snapshot, _StringTable, _string_table, write_snapshot
+from app.services.snapshot_service import SnapshotTranslationService
+
+
+def _table(*keys):
+    return _StringTable(memoryview(_string_table({key: [number] for number, key in enumerate(keys)})))
+
+
+def test_containing_finds_each_key_once():
+    table = _table("abab", "bab", "cab", "xyz")
+    found = sorted(table._key(index).decode() for index in table.containing("ab"))
+    assert found == ["abab", "bab", "cab"]
+
+
+def test_containing_ignores_matches_across_key_boundaries():
+    table = _table("ab", "cd")
+    assert table.containing("bc") == []
+
+
+def test_find_exact_key():
+    table = _table("alpha", "beta")
+    assert table.find("beta") is not None
+    assert table.find("bet") is None
+
+
+def _snapshot(tmp_path):
+    rows = [
+        ("tarun", "house", "noun", "primary", True),
+        ("selam", "peace", "noun", "radical", False),
+        ("akal", "eat", "verb", None, True),
+        ("bera", "house", "noun", "primary", False),
+    ]
+    translations = [
+        Translation.from_mongo({"_id": ObjectId(), "kelma": kelma, "english": english, "cat": cat,
+                                "noun_type": noun_type, "swadesh": swadesh, "root": None})
+        for kelma, english, cat, noun_type, swadesh in rows
+    ]
+    path = str(tmp_path / "kelma.snapshot")
+    write_snapshot(path, {"roots": [], "translations": translations})
+    return Snapshot(path)
+
+
+def _translation_service(snapshot):
+    class Store:
+        def current(self):
+            return snapshot
+
+    return SnapshotTranslationService(Store())
+
+
+def test_sorted_pages_read_the_stored_order(tmp_path):
+    service = _translation_service(_snapshot(tmp_path))
+    page = lambda **kwargs: [service.collection.value(n, "kelma") for n in service._page(**kwargs)]
+
+    assert page(after=None, limit=None, sort=("kelma", ASCENDING)) == ["akal", "bera", "selam", "tarun"]
+    assert page(after=None, limit=2, sort=("english", DESCENDING)) == ["selam", "bera"]
+    bera = service.collection.document(3)["_id"]
+    assert page(after=("bera", bera), limit=None, sort=("kelma", ASCENDING)) == ["selam", "tarun"]
+    assert page(after=None, limit=None, filters={"english": "house", "swadesh": True}) == ["tarun"]
+
+
+def test_facets_count_the_key_columns(tmp_path):
+    service = _translation_service(_snapshot(tmp_path))
+
+    facets = asyncio.run(service.get_facets((("cat", "noun"),)))
+
+    assert facets.total == 3
+    assert facets.cat == {"noun": 3}
+    assert facets.swadesh == {"true": 1, "false": 2}
+    assert facets.noun_type == {"primary": 2, "radical": 1}
@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+from bson import ObjectId, encode
+from bson.raw_bson import RawBSONDocument
+
+from app.services import sync as sync_module
+from app.services.sync import ChangeSync
+
+FIRST, SECOND = ObjectId(), ObjectId()
+
+
+class Recorder:
+    """Stands in for the change feed, recording what sync publishes."""
+
+    def __init__(self):
+        self.events = []
+
+    def upserted(self, collection, doc_id, entry):
+        self.events.append(("upserted", doc_id, entry.root if collection == "roots" else entry.kelma))
+
+    def removed(self, collection, doc_id):
+        self.events.append(("removed", doc_id))
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(sync_module, "change_feed", recorder)
+    return recorder
+
+
+class Cursor:
+    def __init__(self, documents, raw):
+        self.documents = documents
+        self.raw = raw
+
+    def batch_size(self, size):
+        return self
+
+    async def __aiter__(self):
+        for document in self.documents:
+            yield RawBSONDocument(encode(document)) if self.raw else dict(document)
+
+
+class FakeCollection:
+    """A collection answering finds with raw documents, or with dicts when raw BSON is unsupported."""
+
+    def __init__(self, raw=True):
+        self.documents = []
+        self.raw = raw
+
+    def with_options(self, codec_options):
+        if not self.raw:
+            raise NotImplementedError("document_class")
+        assert codec_options.document_class is RawBSONDocument
+        return self
+
+    def find(self, query):
+        return Cursor(self.documents, self.raw)
+
+
+def translation(doc_id, kelma):
+    return {"_id": doc_id, "kelma": kelma, "english": "house", "cat": "noun"}
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_polling_publishes_only_differences(recorder, raw):
+    collection = FakeCollection(raw)
+    sync = ChangeSync()
+    sync._db = {"translations": collection}
+
+    collection.documents = [translation(FIRST, "tarun")]
+    asyncio.run(sync._poll("translations", publish=False))
+    collection.documents = [translation(FIRST, "tarun"), translation(SECOND, "selam")]
+    asyncio.run(sync._poll("translations", publish=True))
+    collection.documents = [translation(SECOND, "salam")]
+    asyncio.run(sync._poll("translations", publish=True))
+
+    assert recorder.events == [
+        ("upserted", str(SECOND), "selam"),
+        ("upserted", str(SECOND), "salam"),
+        ("removed", str(FIRST)),
+    ]
+
+
+def test_polling_skips_an_entry_it_cannot_read(recorder):
+    collection = FakeCollection()
+    sync = ChangeSync()
+    sync._db = {"roots": collection}
+
+    asyncio.run(sync._poll("roots", publish=False))
+    # A root without `mode` fails to load
+    collection.documents = [{"_id": FIRST, "root": "k-t-b"}, {"_id": SECOND, "root": "s-l-m", "mode": {}}]
+    asyncio.run(sync._poll("roots", publish=True))
+
+    assert recorder.events == [("upserted", str(SECOND), "s-l-m")]
+
+
+class Stream:
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for change in self.changes:
+            self.resume_token = change["_id"]
+            yield change
+
+
+class FakeDatabase:
+    """Serves one batch of change events, then stops the follower."""
+
+    def __init__(self, changes):
+        self.streams = [Stream(changes)]
+
+    def watch(self, pipeline, **kwargs):
+        if not self.streams:
+            raise asyncio.CancelledError()
+        return self.streams.pop()
+
+
+def test_stream_skips_an_event_it_cannot_apply(recorder):
+    sync = ChangeSync()
+    sync._db = FakeDatabase([
+        {"_id": {"_data": "1"}, "operationType": "insert", "ns": {"coll": "translations"}},
+        {"_id": {"_data": "2"}, "operationType": "delete", "ns": {"coll": "translations"},
+         "documentKey": {"_id": FIRST}},
+    ])
+
+    try:
+        asyncio.run(sync._follow_stream())
+    except asyncio.CancelledError:
+        pass
+
+    assert recorder.events == [("removed", str(FIRST))]
+    assert sync.resume_token == {"_data": "2"}
+
+
+class CountingDatabase:
+    """Reports a write counter and records which collections get diffed."""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.diffed = []
+
+    async def command(self, name, **kwargs):
+        if not self.counts:
+            raise asyncio.CancelledError()
+        return {"opcounters": {"insert": self.counts.pop(0), "update": 0, "delete": 0, "query": 99}}
+
+
+def test_polling_diffs_only_after_the_server_took_writes(monkeypatch):
+    sync = ChangeSync()
+    sync._poll_seconds = 0
+    sync._db = CountingDatabase([5, 5, 6, 6])
+    sync._writes = 5
+
+    async def poll(collection, publish):
+        sync._db.diffed.append(collection)
+
+    monkeypatch.setattr(sync, "_poll", poll)
+    try:
+        asyncio.run(sync._follow_polling())
+    except asyncio.CancelledError:
+        pass
+
+    assert sync._db.diffed == ["roots", "translations"]
+    assert sync._writes == 6
+
+
+def test_prepare_on_mongomock_falls_back_to_full_reads(recorder):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    sync = ChangeSync()
+
+    async def prepare():
+        db = mongomock_motor.AsyncMongoMockClient()["kelma"]
+        await db.translations.insert_one(translation(FIRST, "tarun"))
+        await sync.prepare(db, poll_seconds=1.0)
+
+    asyncio.run(prepare())
+
+    assert sync.mode == "polling"
+    assert sync._writes is None
+    assert list(sync._fingerprints["translations"]) == [str(FIRST)]
+    assert recorder.events == []
@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.transactions import is_replicated, run_atomically
+
+
+class FakeClient:
+    pass
+
+
+class FakeDatabase:
+    """Answers `hello` like a standalone server or a replica set member, or fails like an unreachable server."""
+
+    def __init__(self, client, reachable=True, replicated=False):
+        self.client = client
+        self.reachable = reachable
+        self.replicated = replicated
+        self.commands = 0
+
+    async def command(self, name):
+        self.commands += 1
+        if not self.reachable:
+            raise ConnectionError()
+        reply = {"isWritablePrimary": True}
+        if self.replicated:
+            reply["setName"] = "rs0"
+        return reply
+
+
+def test_topology_is_asked_once_per_client():
+    db = FakeDatabase(FakeClient())
+    for _ in range(3):
+        assert asyncio.run(run_atomically(db, lambda session: _echo(session))) is None
+    assert db.commands == 1
+
+
+def test_failed_probe_is_not_remembered():
+    db = FakeDatabase(FakeClient(), reachable=False, replicated=True)
+    assert not asyncio.run(is_replicated(db))
+    db.reachable = True
+    assert asyncio.run(is_replicated(db))
+    assert db.commands == 2
+
+
+async def _echo(session):
+    return session
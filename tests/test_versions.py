@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from app.services.versions import CollectionVersions, _VersionListener
+
+
+class Entry(SimpleNamespace):
+    def model_dump_json(self):
+        return self.kelma
+
+
+def test_same_content_gives_the_same_stamp_whatever_the_write_order():
+    first, second = CollectionVersions(), CollectionVersions()
+    second._epoch = first._epoch
+    a, b = _VersionListener(first, "roots"), _VersionListener(second, "roots")
+
+    a.upsert("1", Entry(kelma="tarun"))
+    a.upsert("2", Entry(kelma="selam"))
+    a.upsert("1", Entry(kelma="taruni"))
+    b.upsert("2", Entry(kelma="selam"))
+    b.upsert("3", Entry(kelma="kurak"))
+    b.upsert("1", Entry(kelma="taruni"))
+    b.remove("3")
+
+    assert first.stamp("roots") == second.stamp("roots")
+    assert first.generation("roots") != second.generation("roots")
+
+
+def test_any_change_moves_the_stamp_and_clear_resets_it():
+    versions = CollectionVersions()
+    listener = _VersionListener(versions, "roots")
+    empty = versions.stamp("roots")
+    listener.upsert("1", Entry(kelma="tarun"))
+    changed = versions.stamp("roots")
+    assert changed != empty
+    listener.clear()
+    assert versions.stamp("roots") == empty
+
+
+def test_pinned_stamp_wins():
+    versions = CollectionVersions()
+    versions.pin("roots", "snapshot.1")
+    assert versions.stamp("roots") == "snapshot.1"
+    assert versions.generation("roots") == 1